@@ -1,73 +1,185 @@
 import itertools
 import time
+from concurrent.futures import ProcessPoolExecutor
+from algorithms.results_writer import run_fingerprint
+from algorithms.profiler import aggregate_profiles
+from algorithms.rng import make_rng, root_entropy, run_seed
+
+
+def make_config(params, base=None, seed=None):
+    """
+    Tworzy niezmienny RunConfig pojedynczego przebiegu - konfigurację bazową z nadpisanymi
+    parametrami. Bez base bazą są domyślne wartości RunConfig(), a nie globalny config
+    (zmieniany np. przez GUI), więc wynik i odcisk przebiegu zależą tylko od parametrów.
+    """
+    from algorithms.config import RunConfig, freeze
+
+    changes = {**params, "optimization_type": params.get("optimization_type", "min"),
+               "engine": params.get("engine", "object")}
+    if seed is not None:
+        changes["seed"] = seed
+    return (freeze(base) if base is not None else RunConfig()).replace(**changes)
+
+
+def expand_grid(param_grid):
+    return [dict(zip(param_grid.keys(), values)) for values in itertools.product(*param_grid.values())]
+
+
+def run_job(job):
+    algorithm, run_config = job
+
+    if algorithm == "GA":
+        from algorithms.genetic import run_genetic_algorithm
+        best_solution, execution_time, plotter = run_genetic_algorithm(run_config)
+    else:
+        from algorithms.gjo import run_gjo_algorithm
+        best_solution, execution_time, plotter = run_gjo_algorithm(run_config)
+
+    row = {
+        "best_fitness": best_solution.fitness,
+        "best_solution": best_solution.chromosome_values,
+        "execution_time": execution_time,
+        "best_fitness_history": plotter.best_fitness_history.copy(),
+        "avg_fitness_history": plotter.avg_fitness_history.copy(),
+        "replay": "single",
+        **plotter.run_stats,
+    }
+    if plotter.island_histories:
+        row["island_histories"] = plotter.island_histories
+    return row
+
+
+def run_stacked_job(job):
+    """
+    Wykonuje wszystkie powtórzenia jednej konfiguracji naraz (silnik wieloprzebiegowy).
+    execution_time każdego wiersza to łączny czas podzielony przez liczbę przebiegów.
+    Wiersze mają replay = "stacked" - patrz BatchTester.run_configs.
+    """
+    from algorithms.multi_run import run_multi
+
+    algorithm, run_config, seeds = job
+    runs = len(seeds)
+    results, execution_time = run_multi(algorithm, run_config, runs, [make_rng(seed) for seed in seeds])
+
+    return [{
+        "best_fitness": result["best_individual"].fitness,
+        "best_solution": result["best_individual"].chromosome_values,
+        "execution_time": execution_time / runs,
+        "best_fitness_history": result["best_fitness_history"],
+        "avg_fitness_history": result["avg_fitness_history"],
+        "stop_reason": result["stop_reason"],
+        "generations": result["generations"],
+        "evaluations": result["evaluations"],
+        "stacked_runs": runs,
+        "replay": "stacked",
+        **result["run_stats"],
+    } for result in results]
+
+
+def stackable(run_config):
+    """
+    Czy powtórzenia konfiguracji można wykonać silnikiem wieloprzebiegowym - ten odpowiada
+    silnikowi "array" i nie obsługuje modelu zastępczego.
+    """
+    return run_config.engine == "array" and not run_config.surrogate
+
+
+def run_group_job(job):
+    """
+    Zadanie trybu stack_repeats: (algorytm, RunConfig, ziarna) - przebiegi naraz,
+    (algorytm, RunConfig) - pojedynczy przebieg. Zwraca listę wierszy.
+    """
+    return run_stacked_job(job) if len(job) == 3 else [run_job(job)]
+
 
 class BatchTester:
-    def __init__(self, plotter_class):
+    def __init__(self, plotter_class, workers=1):
         self.plotter_class = plotter_class
+        self.workers = workers
         self.results = []
 
-    def run_batch(self, param_grid_ga, param_grid_gjo, repeats=3):
-        ga_configs = list(itertools.product(*param_grid_ga.values()))
-        gjo_configs = list(itertools.product(*param_grid_gjo.values()))
+    def run_batch(self, param_grid_ga, param_grid_gjo, repeats=3, workers=None, writer=None, seed=None):
+        configs = [("GA", params) for params in expand_grid(param_grid_ga)]
+        configs += [("GJO", params) for params in expand_grid(param_grid_gjo)]
+        self.run_configs(configs, repeats, workers, writer, seed=seed)
 
-        for config in ga_configs:
-            params = dict(zip(param_grid_ga.keys(), config))
-            for _ in range(repeats):
-                result = self.run_ga(params)
-                self.results.append({**params, "algorithm": "GA", **result})
+    def run_configs(self, configs, repeats=3, workers=None, writer=None, stack_repeats=False, seed=None):
+        """
+        Każdy przebieg dostaje własne ziarno run_seed(ziarno główne, konfiguracja, powtórzenie),
+        zapisywane w kolumnie "seed". Bez podanego seed ziarno główne jest losowane.
 
-        for config in gjo_configs:
-            params = dict(zip(param_grid_gjo.keys(), config))
-            for _ in range(repeats):
-                result = self.run_gjo(params)
-                self.results.append({**params, "algorithm": "GJO", **result})
+        stack_repeats łączy powtórzenia konfiguracji silnika "array" (bez modelu zastępczego)
+        w jeden przebieg wieloprzebiegowy; pozostałe konfiguracje są wykonywane osobno.
 
-    def run_ga(self, params):
-        from algorithms.config import config
-        from algorithms.genetic import run_genetic_algorithm
+        Kolumna "replay" mówi, jak odtworzyć wiersz bit po bicie:
+        - "single": run_job((algorytm, make_config(parametry, seed=seed))),
+        - "stacked": run_multi(algorytm, make_config(parametry), 1, [make_rng(seed)]) - silnik
+          wieloprzebiegowy zużywa liczby losowe inaczej niż ArrayPopulation, więc samo
+          config.seed = seed daje w nim inny przebieg.
+        """
+        runs = [(algorithm, params, repeat) for algorithm, params in configs for repeat in range(repeats)]
 
-        config.range_start = params["range_start"]
-        config.range_end = params["range_end"]
-        config.epochs = params["epochs"]
-        config.population_size = params["population_size"]
-        config.precision = params["precision"]
-        config.num_variables = params["num_variables"]
-        config.selection_method = params["selection_method"]
-        config.best_selection_amount = params["best_selection_amount"]
-        config.tournament_size = params["tournament_size"]
-        config.crossover_method = params["crossover_method"]
-        config.crossover_probability = params["crossover_probability"]
-        config.mutation_method = params["mutation_method"]
-        config.mutation_probability = params["mutation_probability"]
-        config.optimization_type = params.get("optimization_type", "min")
-
-        best_solution, execution_time, plotter = run_genetic_algorithm()
-        return {
-            "best_fitness": best_solution.fitness,
-            "best_solution": best_solution.chromosome_values,
-            "execution_time": execution_time,
-            "best_fitness_history": plotter.best_fitness_history.copy(),
-            "avg_fitness_history": plotter.avg_fitness_history.copy(),
-        }
+        if writer is not None:
+            skipped = len(runs)
+            runs = [run for run in runs if not writer.is_done(run_fingerprint(*run, seed=seed))]
+            skipped -= len(runs)
+            if skipped:
+                print(f"Pominięto {skipped} przebiegów zapisanych wcześniej w {writer.results_path}")
 
-    def run_gjo(self, params):
-        from algorithms.config import config
-        from algorithms.gjo import run_gjo_algorithm
+        root = root_entropy(seed)
+        seeds = [run_seed(root, *run) for run in runs]
 
-        config.range_start = params["range_start"]
-        config.range_end = params["range_end"]
-        config.epochs = params["epochs"]
-        config.population_size = params["population_size"]
-        config.precision = params["precision"]
-        config.num_variables = params["num_variables"]
-        config.optimization_type = params.get("optimization_type", "min")
-
-
-        best_solution, execution_time, plotter = run_gjo_algorithm()
-        return {
-            "best_fitness": best_solution.fitness,
-            "best_solution": best_solution.chromosome_values,
-            "execution_time": execution_time,
-            "best_fitness_history": plotter.best_fitness_history.copy(),
-            "avg_fitness_history": plotter.avg_fitness_history.copy(),
-        }
\ No newline at end of file
+        if stack_repeats:
+            # Kolejne powtórzenia tej samej konfiguracji stają się jednym zadaniem R przebiegów;
+            # konfiguracje innych silników (object, islands) wykonywane są przebieg po przebiegu
+            jobs = []
+            for (algorithm, params), group in itertools.groupby(zip(runs, seeds), key=lambda item: item[0][:2]):
+                group_seeds = [job_seed for _, job_seed in group]
+                run_config = make_config(params)
+                if stackable(run_config):
+                    jobs.append((algorithm, run_config, group_seeds))
+                else:
+                    jobs.extend((algorithm, make_config(params, seed=job_seed)) for job_seed in group_seeds)
+            job_func = run_group_job
+        else:
+            jobs = [(algorithm, make_config(params, seed=job_seed))
+                    for (algorithm, params, _), job_seed in zip(runs, seeds)]
+            job_func = run_job
+
+        workers = workers if workers is not None else self.workers
+        if workers is not None and workers > 1:
+            # executor.map zwraca wyniki w kolejności zadań, niezależnie od kolejności ich zakończenia
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                outcomes = executor.map(job_func, jobs)
+                self.collect(runs, seeds, itertools.chain.from_iterable(outcomes) if stack_repeats else outcomes,
+                             writer, seed)
+        else:
+            outcomes = map(job_func, jobs)
+            self.collect(runs, seeds, itertools.chain.from_iterable(outcomes) if stack_repeats else outcomes,
+                         writer, seed)
+
+    def collect(self, runs, seeds, outcomes, writer=None, seed=None):
+        for (algorithm, params, repeat), job_seed, result in zip(runs, seeds, outcomes):
+            row = {**params, "algorithm": algorithm, "repeat": repeat, "seed": job_seed, **result}
+            if writer is not None:
+                row = writer.write(run_fingerprint(algorithm, params, repeat, seed), row)
+            self.results.append(row)
+
+    def profile_summary(self):
+        """
+        Zbiorczy czas faz dla przebiegów uruchomionych z config.profile = True.
+        """
+        return aggregate_profiles(self.results)
+
+    def print_profile_summary(self):
+        for algorithm, phases in self.profile_summary().items():
+            print(f"Profil {algorithm}:")
+            for name, phase in sorted(phases.items(), key=lambda item: -item[1]["time_ms"]):
+                print(f"  {name:<16} {phase['time_ms']:>12.1f} ms {phase['share']:>7.1%} "
+                      f"wywołania: {phase['calls']}")
+
+    def run_ga(self, params):
+        return run_job(("GA", make_config(params)))
+
+    def run_gjo(self, params):
+        return run_job(("GJO", make_config(params)))
@@ -0,0 +1,192 @@
+import numpy as np
+from algorithms.individual import Individual
+from algorithms.crossover import crossover_batch
+from algorithms.mutation import mutate_population
+from algorithms.selection import best_selection_indices, roulette_selection_indices, sus_selection_indices, \
+    tournament_selection_indices
+from algorithms.config import config, freeze
+from algorithms.fitness import evaluate_fitness
+from algorithms.evaluator import make_evaluator
+from algorithms.surrogate import true_mean
+from algorithms.stopping import StopCriteria
+from algorithms.profiler import make_profiler
+from algorithms.rng import make_rng
+
+
+def make_individual(values, fitness, precision=5):
+    """
+    Buduje obiekt Individual z wiersza macierzy genomów, tak aby wynik
+    silnika tablicowego był zgodny z wynikiem klasy Population.
+    """
+    values = [float(v) for v in values]
+    individual = Individual(num_variables=len(values), precision=precision, random_init=False)
+    individual.chromosomes[0].set_chromosome(list(values))
+    individual.chromosome_values = values
+    individual.fitness = float(fitness)
+    return individual
+
+
+class ArrayPopulation:
+    """
+    Populacja przechowywana jako jedna macierz genomów (N x D, float64)
+    oraz równoległy wektor przystosowań. Selekcja, krzyżowanie, mutacja
+    i elityzm operują na tablicach indeksów zamiast na obiektach Individual.
+    """
+
+    def __init__(self, config=config, rng=None):
+        self.config = config = freeze(config)
+        self.size = config.population_size
+        self.num_variables = config.num_variables
+        self.precision = config.precision
+        self.bounds = (config.range_start, config.range_end)
+        self.rng = rng if rng is not None else make_rng(config.seed)
+        self.generation = 0
+        self.genomes = self.rng.uniform(self.bounds[0], self.bounds[1], size=(self.size, self.num_variables))
+        self.fitness = np.full(self.size, np.inf)
+        self.dirty = np.ones(self.size, dtype=bool)
+        self.predicted = np.zeros(self.size, dtype=bool)
+        self.best_index = None
+        self.best_individual = None
+        self.best_fitness_history = []
+        self.avg_fitness_history = []
+        self.evaluator = make_evaluator(config)
+        self.stopping = StopCriteria(config)
+        self.stop_reason = None
+        self.profiler = make_profiler(config)
+
+    def evaluate_all(self, fitness_func=evaluate_fitness, bounds=None):
+        with self.profiler.phase("evaluation"):
+            dirty = np.flatnonzero(self.dirty)
+            if dirty.size:
+                self.fitness[dirty] = self.evaluator.evaluate(fitness_func, self.genomes[dirty])
+                self.predicted[dirty] = self.evaluator.last_predicted
+                self.dirty[dirty] = False
+
+        with self.profiler.phase("history"):
+            self.update_best()
+
+    def update_best(self):
+        if self.config.optimization_type == "max":
+            self.best_index = int(np.argmax(self.fitness))
+        else:
+            self.best_index = int(np.argmin(self.fitness))
+
+        self.best_individual = make_individual(self.genomes[self.best_index], self.fitness[self.best_index],
+                                               self.precision)
+        self.best_fitness_history.append(float(self.fitness[self.best_index]))
+        self.avg_fitness_history.append(true_mean(self.fitness, self.predicted))
+
+    def select_parents(self):
+        method = self.config.selection_method
+        optimization_type = self.config.optimization_type
+
+        if method == "tournament":
+            selected = tournament_selection_indices(self.fitness, self.size, self.config.tournament_size,
+                                                    optimization_type, self.rng)
+        elif method == "best":
+            selected = best_selection_indices(self.fitness, self.config.best_selection_amount, optimization_type)
+        elif method == "roulette":
+            selected = roulette_selection_indices(self.fitness, self.size, optimization_type, self.rng)
+        elif method == "sus":
+            selected = sus_selection_indices(self.fitness, self.size, optimization_type, self.rng)
+        else:
+            raise ValueError(f"Unknown selection method: {method}")
+
+        return selected
+
+    def elite_indices(self):
+        return best_selection_indices(self.fitness, self.config.best_selection_amount, self.config.optimization_type)
+
+    def crossover(self, parents1, parents2, mask):
+        return crossover_batch(self.config.crossover_method, parents1, parents2, mask, self.rng)
+
+    def mutate(self, genomes):
+        return mutate_population(genomes, self.config.mutation_probability, self.config.mutation_method,
+                                 self.bounds, self.config.mutation_sigma, self.rng)
+
+    def emigrants(self, count):
+        """
+        Kopie `count` najlepszych genomów i ich przystosowań (do migracji między wyspami).
+        """
+        best = best_selection_indices(self.fitness, count, self.config.optimization_type)
+        return self.genomes[best].copy(), self.fitness[best].copy()
+
+    def immigrate(self, genomes, fitness):
+        """
+        Zastępuje najgorsze osobniki przybyszami; ich przystosowanie jest już znane.
+        """
+        count = min(len(genomes), self.size)
+        reverse = "min" if self.config.optimization_type == "max" else "max"
+        worst = best_selection_indices(self.fitness, count, reverse)
+        self.genomes[worst] = genomes[:count]
+        self.fitness[worst] = fitness[:count]
+        self.dirty[worst] = False
+        self.predicted[worst] = False
+
+    def evolve(self):
+        profiler = self.profiler
+
+        with profiler.phase("selection"):
+            selected = self.select_parents()
+        with profiler.phase("elitism"):
+            elites = self.elite_indices()
+
+        num_children = self.size - len(elites)
+        num_pairs = (num_children + 1) // 2
+
+        with profiler.phase("crossover"):
+            parents1 = selected[self.rng.integers(0, len(selected), size=num_pairs)]
+            parents2 = selected[self.rng.integers(0, len(selected), size=num_pairs)]
+            mask = self.rng.random(num_pairs) < self.config.crossover_probability
+
+            children1, children2 = self.crossover(self.genomes[parents1], self.genomes[parents2], mask)
+
+            children = np.empty((2 * num_pairs, self.num_variables))
+            children[0::2] = children1
+            children[1::2] = children2
+        with profiler.phase("mutation"):
+            children = self.mutate(children[:num_children])
+
+        # Każde dziecko dziedziczy przystosowanie rodzica, od którego pochodzi jego wiersz;
+        # ponownej ocenie podlegają tylko genomy, które krzyżowanie lub mutacja faktycznie zmieniły
+        with profiler.phase("replacement"):
+            parents = np.empty(2 * num_pairs, dtype=int)
+            parents[0::2] = parents1
+            parents[1::2] = parents2
+            parents = parents[:num_children]
+            changed = np.any(children != self.genomes[parents], axis=1) | self.dirty[parents]
+
+            self.genomes = np.concatenate([children, self.genomes[elites]])
+            self.fitness = np.concatenate([self.fitness[parents], self.fitness[elites]])
+            self.dirty = np.concatenate([changed, self.dirty[elites]])
+            self.predicted = np.concatenate([self.predicted[parents], self.predicted[elites]])
+        self.generation += 1
+
+    def run(self, fitness_func=evaluate_fitness, bounds=None, on_generation=None):
+        """
+        on_generation(gen) jest wywoływane po ocenie i sprawdzeniu kryteriów stopu,
+        a przed krzyżowaniem i mutacją (np. do migracji w modelu wyspowym).
+        """
+        self.stop_reason = "epochs"
+        for gen in range(self.config.epochs):
+            self.evaluate_all(fitness_func, bounds)
+
+            with self.profiler.phase("stopping"):
+                reason = self.stopping.check(self.best_individual.fitness, self.evaluator.evaluations)
+            if reason is not None:
+                self.stop_reason = reason
+                print(f"Zatrzymano w epoce {gen}: {reason}")
+                break
+
+            if on_generation is not None:
+                on_generation(gen)
+
+            self.evolve()
+
+            if gen % 10 == 0:
+                print(f"Epoka {gen}, najlepsze przystosowanie: {self.best_individual.fitness}")
+        else:
+            self.evaluate_all(fitness_func, bounds)
+
+        self.evaluator.close()
+        return self.best_individual, self.best_fitness_history, self.avg_fitness_history
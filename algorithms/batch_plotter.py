@@ -5,8 +5,12 @@ import pandas as pd
 import numpy as np
 
 class ResultsWindow:
-    def __init__(self, results):
+    def __init__(self, results, histories=None):
         self.results = pd.DataFrame(results)
+        self.histories = histories
+        if histories is not None:
+            # Jedna macierz (przebiegi x generacje) zamiast list w kolumnie DataFrame
+            self.best_history_matrix = histories.matrix("best", pad="edge")
         self.root = tk.Tk()
         self.root.title("Porównanie algorytmów GA i GJO")
         self.root.geometry("1200x800")
@@ -62,8 +66,13 @@ class ResultsWindow:
             alg_data = filtered[filtered["algorithm"] == alg]
             if alg_data.empty:
                 continue
+            if self.histories is not None and "run_id" in alg_data.columns:
+                rows = [self.histories.rows[run_id] for run_id in alg_data["run_id"] if run_id in self.histories.rows]
+                max_len = max(self.histories.lengths["best"][row] for row in rows)
+                avg_history = self.best_history_matrix[rows, :max_len].mean(axis=0)
+                self.ax.plot(range(1, len(avg_history)+1), avg_history, label=f"{alg} (pop={pop_size})")
             # Jeśli masz best_fitness_history jako listę w wynikach, użyj jej:
-            if "best_fitness_history" in alg_data.columns and not alg_data["best_fitness_history"].isnull().all():
+            elif "best_fitness_history" in alg_data.columns and not alg_data["best_fitness_history"].isnull().all():
                 # Zakładamy, że każda próba ma best_fitness_history jako listę
                 histories = alg_data["best_fitness_history"].dropna().tolist()
                 # Uśrednij historie po próbach
@@ -97,6 +106,6 @@ class ResultsWindow:
         self.root.mainloop()
 
 
-def show_results_window(results):
-    window = ResultsWindow(results)
+def show_results_window(results, histories=None):
+    window = ResultsWindow(results, histories)
     window.run()
\ No newline at end of file
@@ -2,13 +2,13 @@ import random
 
 
 class Chromosome:
-    def __init__(self, num_genes=1, a=-20, b=20, random_init=True):
+    def __init__(self, num_genes=1, a=-20, b=20, random_init=True, rng=random):
         self.num_genes = num_genes
         self.a = a
         self.b = b
 
         if random_init:
-            self.chromosome = [random.uniform(a, b) for _ in range(self.num_genes)]
+            self.chromosome = [rng.uniform(a, b) for _ in range(self.num_genes)]
         else:
 
             self.chromosome = [(a + b) / 2 for _ in range(self.num_genes)]
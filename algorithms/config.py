@@ -15,6 +15,139 @@ class Config:
         self.crossover_probability = 0.8
         self.mutation_method = "uniform"
         self.mutation_probability = 0.05
+        self.mutation_sigma = 1.0
         self.optimization_type = "min"
+        self.engine = "object"
+        self.evaluator = "serial"
+        self.evaluator_workers = None
+        self.evaluator_chunk_size = None
+        self.fitness_cache_size = 0
+        self.stagnation_window = 0
+        self.stagnation_tolerance = 0.0
+        self.target_fitness = None
+        self.max_evaluations = None
+        self.time_limit = None
+        self.profile = False
+        self.seed = None
+        self.islands = 4
+        self.migration_interval = 10
+        self.migration_size = 2
+        self.migration_topology = "ring"
+        self.island_backend = "process"
+        self.surrogate = False
+        self.surrogate_fraction = 0.3
+        self.surrogate_archive_size = 500
+        self.surrogate_min_archive = None
 
 config = Config()
+
+
+SELECTION_METHODS = ("best", "roulette", "tournament", "sus")
+MUTATION_METHODS = ("uniform", "gaussian")
+OPTIMIZATION_TYPES = ("min", "max")
+ENGINES = ("object", "array", "islands")
+EVALUATORS = ("serial", "thread", "process")
+MIGRATION_TOPOLOGIES = ("ring", "full")
+ISLAND_BACKENDS = ("process", "thread")
+
+
+def _check(condition, message):
+    if not condition:
+        raise ValueError(message)
+
+
+class RunConfig:
+    """
+    Niezmienna konfiguracja jednego przebiegu: te same pola co Config, ale w __slots__,
+    sprawdzone przy tworzeniu i tylko do odczytu. Przekazywana jawnie do populacji, GJO
+    i ewaluatora, więc kilka przebiegów w jednym procesie (wątki, GUI) nie dzieli stanu.
+    Zmiany tworzą nowy obiekt: run_config.replace(epochs=200).
+    """
+
+    __slots__ = tuple(vars(Config()))
+
+    def __init__(self, **values):
+        unknown = set(values) - set(self.__slots__)
+        if unknown:
+            raise TypeError(f"Unknown config fields: {', '.join(sorted(unknown))}")
+
+        defaults = Config()
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name] if name in values else getattr(defaults, name))
+        self.validate()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"RunConfig is immutable, use replace({name}=...)")
+
+    def __delattr__(self, name):
+        raise AttributeError("RunConfig is immutable")
+
+    def __getstate__(self):
+        return self.as_dict()
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def __eq__(self, other):
+        return isinstance(other, RunConfig) and self.as_dict() == other.as_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"RunConfig({fields})"
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def replace(self, **changes):
+        return RunConfig(**{**self.as_dict(), **changes})
+
+    def validate(self):
+        from algorithms.fitness import FITNESS_FUNCTIONS
+        from algorithms.crossover import CROSSOVER_METHODS
+
+        _check(self.function in FITNESS_FUNCTIONS, f"Unknown fitness function: {self.function}")
+        _check(self.range_start < self.range_end, "range_start must be lower than range_end")
+        _check(self.population_size >= 2, "population_size must be at least 2")
+        _check(self.num_variables >= 1, "num_variables must be at least 1")
+        _check(self.precision >= 0, "precision must be non-negative")
+        _check(self.epochs >= 0, "epochs must be non-negative")
+        _check(0 <= self.best_selection_amount <= self.population_size,
+               "best_selection_amount must be between 0 and population_size")
+        _check(self.tournament_size >= 1, "tournament_size must be at least 1")
+        _check(0.0 <= self.crossover_probability <= 1.0, "crossover_probability must be in [0, 1]")
+        _check(0.0 <= self.mutation_probability <= 1.0, "mutation_probability must be in [0, 1]")
+        _check(self.selection_method in SELECTION_METHODS, f"Unknown selection method: {self.selection_method}")
+        _check(self.crossover_method in CROSSOVER_METHODS, f"Unknown crossover method: {self.crossover_method}")
+        _check(self.mutation_method in MUTATION_METHODS, f"Unknown mutation method: {self.mutation_method}")
+        _check(self.optimization_type in OPTIMIZATION_TYPES,
+               f"Unknown optimization type: {self.optimization_type}")
+        _check(self.engine in ENGINES, f"Unknown engine: {self.engine}")
+        _check(self.evaluator in EVALUATORS, f"Unknown evaluator: {self.evaluator}")
+        _check(self.evaluator_workers is None or self.evaluator_workers >= 1, "evaluator_workers must be at least 1")
+        _check(self.fitness_cache_size >= 0, "fitness_cache_size must be non-negative")
+        _check(self.stagnation_window >= 0, "stagnation_window must be non-negative")
+        _check(self.max_evaluations is None or self.max_evaluations > 0, "max_evaluations must be positive")
+        _check(self.time_limit is None or self.time_limit > 0, "time_limit must be positive")
+        _check(self.islands >= 1, "islands must be at least 1")
+        _check(self.migration_interval >= 0, "migration_interval must be non-negative")
+        _check(0 <= self.migration_size <= self.population_size,
+               "migration_size must be between 0 and population_size")
+        _check(self.migration_topology in MIGRATION_TOPOLOGIES,
+               f"Unknown migration topology: {self.migration_topology}")
+        _check(self.island_backend in ISLAND_BACKENDS, f"Unknown island backend: {self.island_backend}")
+        _check(0.0 < self.surrogate_fraction <= 1.0, "surrogate_fraction must be in (0, 1]")
+        _check(self.surrogate_archive_size >= 2, "surrogate_archive_size must be at least 2")
+        _check(self.surrogate_min_archive is None or 2 <= self.surrogate_min_archive <= self.surrogate_archive_size,
+               "surrogate_min_archive must be between 2 and surrogate_archive_size")
+
+
+def freeze(config_obj=config):
+    """
+    Zamienia edytowalny Config (np. globalny config) w RunConfig; RunConfig zwraca bez zmian.
+    """
+    if isinstance(config_obj, RunConfig):
+        return config_obj
+    return RunConfig(**vars(config_obj))
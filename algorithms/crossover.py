@@ -1,32 +1,33 @@
 import random
+import numpy as np
 
-def arithmetic_crossover(parent1, parent2):
-    alpha = random.random()
+def arithmetic_crossover(parent1, parent2, rng=random):
+    alpha = rng.random()
     child1 = [alpha * p1 + (1 - alpha) * p2 for p1, p2 in zip(parent1, parent2)]
     child2 = [(1 - alpha) * p1 + alpha * p2 for p1, p2 in zip(parent1, parent2)]
     return child1, child2
 
-def linear_crossover(parent1, parent2):
+def linear_crossover(parent1, parent2, rng=random):
     c1 = [0.5 * (p1 + p2) for p1, p2 in zip(parent1, parent2)]
     c2 = [1.5 * p1 - 0.5 * p2 for p1, p2 in zip(parent1, parent2)]
     c3 = [-0.5 * p1 + 1.5 * p2 for p1, p2 in zip(parent1, parent2)]
 
     return c1, c2
 
-def blend_alpha_crossover(parent1, parent2, alpha=0.5):
+def blend_alpha_crossover(parent1, parent2, rng=random, alpha=0.5):
     child1 = []
     child2 = []
     for p1, p2 in zip(parent1, parent2):
         d = abs(p1 - p2)
         lower = min(p1, p2) - alpha * d
         upper = max(p1, p2) + alpha * d
-        c1 = random.uniform(lower, upper)
-        c2 = random.uniform(lower, upper)
+        c1 = rng.uniform(lower, upper)
+        c2 = rng.uniform(lower, upper)
         child1.append(c1)
         child2.append(c2)
     return child1, child2
 
-def blend_alpha_beta_crossover(parent1, parent2, alpha=0.75, beta=0.25):
+def blend_alpha_beta_crossover(parent1, parent2, rng=random, alpha=0.75, beta=0.25):
     child1 = []
     child2 = []
     for p1, p2 in zip(parent1, parent2):
@@ -35,13 +36,86 @@ def blend_alpha_beta_crossover(parent1, parent2, alpha=0.75, beta=0.25):
         max_val = max(p1, p2)
         lower = min_val - alpha * d
         upper = max_val + beta * d
-        c1 = random.uniform(lower, upper)
-        c2 = random.uniform(lower, upper)
+        c1 = rng.uniform(lower, upper)
+        c2 = rng.uniform(lower, upper)
         child1.append(c1)
         child2.append(c2)
     return child1, child2
 
-def averaging_crossover(parent1, parent2):
+def averaging_crossover(parent1, parent2, rng=random):
     child1 = [(p1 + p2) / 2 for p1, p2 in zip(parent1, parent2)]
     child2 = [(p1 + p2) / 2 for p1, p2 in zip(parent1, parent2)]
-    return child1, child2
\ No newline at end of file
+    return child1, child2
+
+def arithmetic_crossover_batch(parents1, parents2, rng):
+    alpha = rng.random(parents1.shape[:-1] + (1,))
+    child1 = alpha * parents1 + (1 - alpha) * parents2
+    child2 = (1 - alpha) * parents1 + alpha * parents2
+    return child1, child2
+
+def linear_crossover_batch(parents1, parents2, rng=None):
+    c1 = 0.5 * (parents1 + parents2)
+    c2 = 1.5 * parents1 - 0.5 * parents2
+    return c1, c2
+
+def blend_alpha_crossover_batch(parents1, parents2, rng, alpha=0.5):
+    return blend_alpha_beta_crossover_batch(parents1, parents2, rng, alpha=alpha, beta=alpha)
+
+def blend_alpha_beta_crossover_batch(parents1, parents2, rng, alpha=0.75, beta=0.25):
+    d = np.abs(parents1 - parents2)
+    lower = np.minimum(parents1, parents2) - alpha * d
+    upper = np.maximum(parents1, parents2) + beta * d
+    span = upper - lower
+    child1 = lower + rng.random(parents1.shape) * span
+    child2 = lower + rng.random(parents1.shape) * span
+    return child1, child2
+
+def averaging_crossover_batch(parents1, parents2, rng=None):
+    child1 = (parents1 + parents2) / 2
+    return child1, child1.copy()
+
+
+CROSSOVER_METHODS = {
+    "arithmetic": arithmetic_crossover,
+    "linear": linear_crossover,
+    "blend_alpha": blend_alpha_crossover,
+    "blend_alpha_beta": blend_alpha_beta_crossover,
+    "averaging": averaging_crossover,
+}
+
+BATCH_CROSSOVER_METHODS = {
+    "arithmetic": arithmetic_crossover_batch,
+    "linear": linear_crossover_batch,
+    "blend_alpha": blend_alpha_crossover_batch,
+    "blend_alpha_beta": blend_alpha_beta_crossover_batch,
+    "averaging": averaging_crossover_batch,
+}
+
+
+def crossover_batch(method, parents1, parents2, mask, rng=None):
+    """
+    Krzyżowanie wszystkich par rodziców naraz.
+
+    Args:
+        method: Nazwa metody krzyżowania
+        parents1: Macierz pierwszych rodziców (P x D)
+        parents2: Macierz drugich rodziców (P x D)
+        mask: Wektor logiczny (P) - pary, które podlegają krzyżowaniu
+        rng: Generator liczb losowych numpy
+
+    Returns:
+        Dwie macierze potomków (P x D); pary spoza maski są kopiami rodziców
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    operator = BATCH_CROSSOVER_METHODS.get(method, arithmetic_crossover_batch)
+
+    children1 = parents1.copy()
+    children2 = parents2.copy()
+    if mask.any():
+        crossed1, crossed2 = operator(parents1[mask], parents2[mask], rng)
+        children1[mask] = crossed1
+        children2[mask] = crossed2
+
+    return children1, children2
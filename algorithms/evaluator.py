@@ -0,0 +1,172 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+from algorithms.config import config
+from algorithms.fitness import resolve_batch_fitness, batch_from_scalar
+from algorithms.fitness_cache import FitnessCache
+from algorithms.surrogate import SurrogateScreen
+
+
+def fitness_factory(func):
+    """
+    Oznacza funkcję jako fabrykę funkcji celu: wywoływana jest raz na wątek/proces
+    roboczy i zwraca właściwą funkcję celu (np. po kosztownym przygotowaniu symulacji).
+    """
+    func.factory = True
+    return func
+
+
+def build_batch_fitness(fitness_func, config_obj):
+    if getattr(fitness_func, "factory", False):
+        fitness_func = fitness_func()
+
+    batch_func = resolve_batch_fitness(fitness_func, config_obj)
+    if batch_func is None:
+        batch_func = batch_from_scalar(fitness_func, config_obj.num_variables, config_obj.precision)
+    return batch_func
+
+
+_worker_state = threading.local()
+
+
+def _init_worker(fitness_func, config_obj):
+    _worker_state.batch_func = build_batch_fitness(fitness_func, config_obj)
+
+
+def _evaluate_chunk(chunk):
+    return np.asarray(_worker_state.batch_func(chunk), dtype=float)
+
+
+class SerialEvaluator:
+
+    def __init__(self, config_obj=config, workers=None, chunk_size=None, cache=None, surrogate=None):
+        self.config = config_obj
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.surrogate = surrogate
+        self.fitness_source = None
+        self.batch_func = None
+        self.evaluations = 0
+        self.last_predicted = np.zeros(0, dtype=bool)
+
+    def prepare(self, fitness_func):
+        if self.batch_func is None or self.fitness_source is not fitness_func:
+            self.close()
+            if self.fitness_source is not fitness_func:
+                if self.cache is not None:
+                    self.cache.clear()
+                if self.surrogate is not None:
+                    self.surrogate.clear()
+            self.fitness_source = fitness_func
+            self.batch_func = self.start(fitness_func)
+
+    def start(self, fitness_func):
+        return build_batch_fitness(fitness_func, self.config)
+
+    def evaluate(self, fitness_func, genomes):
+        self.prepare(fitness_func)
+        self.last_predicted = np.zeros(len(genomes), dtype=bool)
+        if len(genomes) == 0:
+            return np.empty(0)
+
+        if self.surrogate is None:
+            return self.true_evaluate(genomes)
+        if self.cache is None:
+            values = self.surrogate.evaluate(genomes, self.true_evaluate)
+            self.last_predicted = self.surrogate.last_predicted
+            return values
+
+        # Genomy z pamięci podręcznej mają prawdziwe wartości - model ocenia tylko chybienia
+        values, hits = self.cache.lookup(genomes)
+        misses = ~hits
+        if misses.any():
+            values[misses] = self.surrogate.evaluate(genomes[misses], self.true_evaluate)
+            self.last_predicted[misses] = self.surrogate.last_predicted
+        return values
+
+    def true_evaluate(self, genomes):
+        if self.cache is not None:
+            return self.cache.evaluate(genomes, self.counted_compute)
+        return self.counted_compute(genomes)
+
+    def counted_compute(self, genomes):
+        self.evaluations += len(genomes)
+        return self.compute(genomes)
+
+    def compute(self, genomes):
+        return np.asarray(self.batch_func(genomes), dtype=float)
+
+    def stats(self):
+        stats = {"evaluations": self.evaluations}
+        if self.cache is not None:
+            stats.update(self.cache.stats())
+        if self.surrogate is not None:
+            stats.update(self.surrogate.stats())
+        return stats
+
+    def close(self):
+        self.batch_func = None
+
+
+class PoolEvaluator(SerialEvaluator):
+    executor_class = None
+
+    def __init__(self, config_obj=config, workers=None, chunk_size=None, cache=None, surrogate=None):
+        super().__init__(config_obj, workers or os.cpu_count() or 1, chunk_size, cache, surrogate)
+        self.executor = None
+
+    def start(self, fitness_func):
+        self.executor = self.executor_class(max_workers=self.workers, initializer=_init_worker,
+                                            initargs=(fitness_func, self.config))
+        return _evaluate_chunk
+
+    def chunks(self, genomes):
+        if self.chunk_size:
+            num_chunks = -(-len(genomes) // self.chunk_size)
+        else:
+            num_chunks = self.workers * 4
+        return np.array_split(genomes, max(1, min(num_chunks, len(genomes))))
+
+    def compute(self, genomes):
+        # Do procesów roboczych trafiają tylko fragmenty macierzy genomów; wyniki wracają w kolejności
+        results = self.executor.map(_evaluate_chunk, self.chunks(genomes))
+        return np.concatenate(list(results))
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        self.batch_func = None
+
+
+class ThreadPoolEvaluator(PoolEvaluator):
+    executor_class = ThreadPoolExecutor
+
+
+class ProcessPoolEvaluator(PoolEvaluator):
+    executor_class = ProcessPoolExecutor
+
+
+EVALUATORS = {
+    "serial": SerialEvaluator,
+    "thread": ThreadPoolEvaluator,
+    "process": ProcessPoolEvaluator,
+}
+
+
+def make_evaluator(config_obj=config):
+    evaluator_class = EVALUATORS.get(config_obj.evaluator)
+    if evaluator_class is None:
+        raise ValueError(f"Unknown evaluator: {config_obj.evaluator}")
+    cache = None
+    if config_obj.fitness_cache_size:
+        cache = FitnessCache(config_obj.fitness_cache_size, config_obj.precision)
+    surrogate = None
+    if config_obj.surrogate:
+        surrogate = SurrogateScreen((config_obj.range_start, config_obj.range_end), config_obj.surrogate_fraction,
+                                    config_obj.surrogate_archive_size, config_obj.surrogate_min_archive,
+                                    config_obj.optimization_type)
+    return evaluator_class(config_obj, config_obj.evaluator_workers, config_obj.evaluator_chunk_size, cache,
+                           surrogate)
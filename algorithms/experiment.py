@@ -0,0 +1,193 @@
+import json
+import math
+import os
+import random
+import re
+from algorithms.BatchTester import BatchTester, expand_grid
+from algorithms.results_writer import ResultsWriter
+
+
+DEFAULT_EXPERIMENT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  "experiments", "default.json")
+
+ALGORITHMS = ("GA", "GJO")
+
+EXPERIMENT_KEYS = ("name", "output", "repeats", "workers", "seed", "stack_repeats", "plots", "preview", "base",
+                   "algorithms")
+ALGORITHM_KEYS = ("grid", "samples", "num_samples")
+
+
+def load_experiment(path):
+    """
+    Wczytuje opis eksperymentu z pliku JSON lub TOML.
+
+    Klucze: name, output, repeats, workers, seed, stack_repeats, plots, preview, base (parametry wspólne) oraz
+    algorithms -> {"GA"|"GJO": {"grid": {...}, "samples": {...}, "num_samples": n}}.
+    Nieznane klucze są błędem; eksperyment z samples wymaga seed.
+    """
+    if path.endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as file:
+            experiment = tomllib.load(file)
+    else:
+        with open(path, encoding="utf-8") as file:
+            experiment = json.load(file)
+
+    unknown = set(experiment) - set(EXPERIMENT_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown experiment keys: {', '.join(sorted(unknown))}")
+
+    unknown = set(experiment.get("algorithms", {})) - set(ALGORITHMS)
+    if unknown:
+        raise ValueError(f"Unknown algorithms in experiment: {', '.join(sorted(unknown))}")
+
+    for algorithm, spec in experiment.get("algorithms", {}).items():
+        unknown = set(spec) - set(ALGORITHM_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown keys for {algorithm}: {', '.join(sorted(unknown))}")
+        # Bez ziarna każde wznowienie losowałoby inne wartości, więc żaden przebieg nie zostałby pominięty
+        if spec.get("samples") and experiment.get("seed") is None:
+            raise ValueError(f"Experiment with samples for {algorithm} requires a seed")
+
+    experiment.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    experiment.setdefault("output", "results")
+    experiment.setdefault("repeats", 3)
+    experiment.setdefault("workers", None)
+    experiment.setdefault("seed", None)
+    experiment.setdefault("base", {})
+    experiment.setdefault("stack_repeats", False)
+    experiment.setdefault("plots", False)
+    experiment.setdefault("preview", False)
+    return experiment
+
+
+def sample_value(spec, rng):
+    """
+    Losuje wartość parametru: {"uniform": [a, b]}, {"log_uniform": [a, b]},
+    {"int": [a, b]} (włącznie) lub {"choice": [...]}.
+    """
+    if "uniform" in spec:
+        return rng.uniform(*spec["uniform"])
+    if "log_uniform" in spec:
+        low, high = spec["log_uniform"]
+        return math.exp(rng.uniform(math.log(low), math.log(high)))
+    if "int" in spec:
+        return rng.randint(*spec["int"])
+    if "choice" in spec:
+        return rng.choice(spec["choice"])
+    raise ValueError(f"Unknown sampling spec: {spec}")
+
+
+def experiment_configs(experiment):
+    rng = random.Random(experiment["seed"])
+    configs = []
+
+    for algorithm in ALGORITHMS:
+        spec = experiment.get("algorithms", {}).get(algorithm)
+        if spec is None:
+            continue
+
+        samples = spec.get("samples", {})
+        num_samples = spec.get("num_samples", 10 if samples else 1)
+        for point in expand_grid(spec.get("grid", {})):
+            for _ in range(num_samples):
+                sampled = {name: sample_value(value, rng) for name, value in samples.items()}
+                configs.append((algorithm, {**experiment["base"], **point, **sampled}))
+
+    return configs
+
+
+def swept_params(experiment, configs):
+    """
+    Parametry kategoryczne, które w konfiguracjach eksperymentu (z experiment_configs)
+    przyjmują więcej niż jedną wartość - z siatki lub losowane z "choice". Wartości losowane
+    z przedziału (uniform, log_uniform, int) są pomijane: każda próbka byłaby osobną kategorią.
+    """
+    sampled = {name for spec in experiment.get("algorithms", {}).values()
+               for name, sample in spec.get("samples", {}).items() if "choice" not in sample}
+    values = {}
+    for _, params in configs:
+        for name, value in params.items():
+            values.setdefault(name, set()).add(str(value))
+    return [name for name, unique in values.items() if len(unique) > 1 and name not in sampled]
+
+
+def safe_filename(text):
+    """
+    Fragment nazwy pliku bez separatorów ścieżki i znaków spoza [A-Za-z0-9_-].
+    """
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", text.replace(".", "p")).strip("_") or "_"
+
+
+def render_experiment_plots(experiment, configs, results, writer, workers=None, preview=False):
+    """
+    Zleca do RenderQueue wykresy porównawcze dla każdego zmienianego parametru oraz historię
+    najlepszego przebiegu każdej konfiguracji. Wykresy z niezmienionymi danymi są pomijane.
+    """
+    from apps.render_queue import RenderQueue
+
+    params = swept_params(experiment, configs)
+    output_dir = os.path.join(experiment["output"], f"{experiment['name']}_plots")
+    with RenderQueue(output_dir, workers=workers, preview=preview) as render_queue:
+        for param in params:
+            # Tylko kolumny potrzebne do wykresu - czasy wykonania zmieniałyby skrót przy każdym przebiegu
+            data = [{"algorithm": row["algorithm"], param: row[param], "best_fitness": row["best_fitness"]}
+                    for row in results if param in row]
+            if data:
+                render_queue.submit("batch_comparison", data, f"batch_comparison_{safe_filename(param)}.png",
+                                    category_param=param)
+
+        best_runs = {}
+        for row in results:
+            key = (row["algorithm"],) + tuple(str(row.get(param)) for param in params)
+            sign = -1 if row.get("optimization_type") == "max" else 1
+            if key not in best_runs or sign * row["best_fitness"] < sign * best_runs[key]["best_fitness"]:
+                best_runs[key] = row
+        for key, row in sorted(best_runs.items()):
+            best = writer.histories.history(row["run_id"], "best")
+            avg = writer.histories.history(row["run_id"], "avg")
+            name = safe_filename("_".join(key))
+            render_queue.submit("fitness_history", {"best_fitness_history": best, "avg_fitness_history": avg},
+                                f"fitness_history_{name}.png",
+                                title=f"Historia wartości funkcji celu: {', '.join(key)}")
+
+        paths = render_queue.wait()
+        print(f"Wyrenderowano wykresy: {len(paths)}, bez zmian: {render_queue.skipped} ({output_dir})")
+    return paths
+
+
+def run_experiment(path=DEFAULT_EXPERIMENT, resume=False, workers=None, repeats=None, show=False,
+                   stack_repeats=None, plots=None, preview=None):
+    import pandas as pd
+
+    experiment = load_experiment(path)
+    workers = workers or experiment["workers"] or os.cpu_count()
+    repeats = repeats or experiment["repeats"]
+    stack_repeats = experiment["stack_repeats"] if stack_repeats is None else stack_repeats
+    plots = experiment["plots"] if plots is None else plots
+    preview = experiment["preview"] if preview is None else preview
+    configs = experiment_configs(experiment)
+    print(f"Eksperyment {experiment['name']}: {len(configs)} konfiguracji x {repeats} powtórzeń, "
+          f"procesy: {workers}")
+
+    writer = ResultsWriter(experiment["output"], experiment["name"], resume=resume)
+    tester = BatchTester(plotter_class=None, workers=workers)
+    tester.run_configs(configs, repeats=repeats, writer=writer, stack_repeats=stack_repeats,
+                       seed=experiment["seed"])
+    tester.print_profile_summary()
+
+    results = writer.load()
+    writer.histories.save_npz()
+    df = pd.DataFrame(results)
+    df.to_csv(os.path.join(experiment["output"], f"{experiment['name']}.csv"), index=False)
+    if "population_size" in df.columns:
+        print(df.groupby(["algorithm", "population_size"])["best_fitness"].agg(["mean", "std"]))
+
+    if plots or preview:
+        render_experiment_plots(experiment, configs, results, writer, workers=workers, preview=preview)
+
+    if show:
+        from algorithms.batch_plotter import show_results_window
+        show_results_window(results, writer.histories)
+
+    return results
@@ -24,12 +24,137 @@ def martin_and_gaddy(individual: Individual):
     return (x1 - x2) ** 2 + ((x1 + x2 - 10) / 3) ** 2
 
 
+def batch_fitness(func):
+    """
+    Oznacza funkcję jako wsadową: przyjmuje macierz (N x D) i zwraca wektor N wartości.
+    """
+    func.batch = True
+    return func
+
+
+@batch_fitness
+def hypersphere_batch(genomes):
+    return np.einsum("ij,ij->i", genomes, genomes)
+
+
+@batch_fitness
+def martin_and_gaddy_batch(genomes):
+    if genomes.shape[1] < 2:
+        print("Ostrzeżenie: chromosome_values ma mniej niż 2 elementy")
+        return np.full(genomes.shape[0], np.inf)
+
+    x1 = genomes[:, 0]
+    x2 = genomes[:, 1]
+    return (x1 - x2) ** 2 + ((x1 + x2 - 10) / 3) ** 2
+
+
+@batch_fitness
+def rastrigin_batch(genomes):
+    return 10.0 * genomes.shape[1] + np.sum(genomes ** 2 - 10.0 * np.cos(2 * np.pi * genomes), axis=1)
+
+
+@batch_fitness
+def rosenbrock_batch(genomes):
+    if genomes.shape[1] < 2:
+        print("Ostrzeżenie: chromosome_values ma mniej niż 2 elementy")
+        return np.full(genomes.shape[0], np.inf)
+
+    head = genomes[:, :-1]
+    tail = genomes[:, 1:]
+    return np.sum(100.0 * (tail - head ** 2) ** 2 + (1.0 - head) ** 2, axis=1)
+
+
+@batch_fitness
+def ackley_batch(genomes):
+    d = genomes.shape[1]
+    sum_sq = np.sum(genomes ** 2, axis=1)
+    sum_cos = np.sum(np.cos(2 * np.pi * genomes), axis=1)
+    return -20.0 * np.exp(-0.2 * np.sqrt(sum_sq / d)) - np.exp(sum_cos / d) + 20.0 + np.e
+
+
+@batch_fitness
+def griewank_batch(genomes):
+    i = np.sqrt(np.arange(1, genomes.shape[1] + 1))
+    return 1.0 + np.sum(genomes ** 2, axis=1) / 4000.0 - np.prod(np.cos(genomes / i), axis=1)
+
+
+@batch_fitness
+def schwefel_batch(genomes):
+    return 418.9829 * genomes.shape[1] - np.sum(genomes * np.sin(np.sqrt(np.abs(genomes))), axis=1)
+
+
+BATCH_FUNCTIONS = {
+    "Martin and Gaddy": martin_and_gaddy_batch,
+    "hypersphere": hypersphere_batch,
+    "Rastrigin": rastrigin_batch,
+    "Rosenbrock": rosenbrock_batch,
+    "Ackley": ackley_batch,
+    "Griewank": griewank_batch,
+    "Schwefel": schwefel_batch,
+}
+
+
+def scalar_from_batch(batch_func):
+    def fitness(individual: Individual):
+        if individual.chromosome_values is None or len(individual.chromosome_values) == 0:
+            print("Ostrzeżenie: chromosome_values jest None lub puste")
+            return float('inf')
+        genomes = np.asarray(individual.chromosome_values, dtype=float).reshape(1, -1)
+        return float(batch_func(genomes)[0])
+
+    return fitness
+
+
+FITNESS_FUNCTIONS = {
+    "Martin and Gaddy": martin_and_gaddy,
+    "hypersphere": hypersphere,
+    "Rastrigin": scalar_from_batch(rastrigin_batch),
+    "Rosenbrock": scalar_from_batch(rosenbrock_batch),
+    "Ackley": scalar_from_batch(ackley_batch),
+    "Griewank": scalar_from_batch(griewank_batch),
+    "Schwefel": scalar_from_batch(schwefel_batch),
+}
+
+
+def batch_from_scalar(fitness_func, num_variables, precision=5):
+    """
+    Opakowuje funkcję przyjmującą pojedynczy Individual w interfejs wsadowy.
+    """
+    probe = Individual(num_variables=num_variables, precision=precision, random_init=False)
+
+    def fitness(genomes):
+        values = np.empty(genomes.shape[0])
+        for i, row in enumerate(genomes):
+            probe.chromosome_values = row.tolist()
+            values[i] = fitness_func(probe)
+        return values
+
+    return fitness
+
+
+def resolve_batch_fitness(fitness_func=None, config_obj=config):
+    """
+    Zwraca wsadową funkcję celu dla danego przebiegu albo None, jeśli
+    fitness_func działa tylko na pojedynczych osobnikach.
+    """
+    if fitness_func is None or fitness_func is evaluate_fitness:
+        batch_func = BATCH_FUNCTIONS.get(config_obj.function)
+        if batch_func is None:
+            print(f"Ostrzeżenie: Nieznana funkcja fitness: {config_obj.function}")
+            return batch_fitness(lambda genomes: np.full(genomes.shape[0], np.inf))
+        return batch_func
+
+    if getattr(fitness_func, "batch", False):
+        return fitness_func
+
+    return None
+
+
 def evaluate_fitness(individual: Individual):
-    
-    if config.function == "Martin and Gaddy":
-        return martin_and_gaddy(individual)
-    elif config.function == "hypersphere":
-        return hypersphere(individual)
-    else:
+
+    fitness_func = FITNESS_FUNCTIONS.get(config.function)
+    if fitness_func is None:
         print(f"Ostrzeżenie: Nieznana funkcja fitness: {config.function}")
-        return float('inf')
\ No newline at end of file
+        return float('inf')
+
+    return fitness_func(individual)
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+import numpy as np
+
+
+class FitnessCache:
+    """
+    Ograniczona pamięć podręczna wartości funkcji celu (LRU). Kluczem jest genom
+    zaokrąglony do config.precision miejsc po przecinku.
+    """
+
+    def __init__(self, maxsize=10000, precision=5):
+        self.maxsize = maxsize
+        self.precision = precision
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def keys(self, genomes):
+        rounded = np.round(genomes, self.precision) + 0.0  # +0.0 zamienia -0.0 na 0.0
+        return [row.tobytes() for row in rounded]
+
+    def lookup(self, genomes):
+        """
+        Zwraca (wartości, maska trafień) bez liczenia brakujących genomów;
+        wartości w miejscach chybień są nieokreślone.
+        """
+        values = np.empty(len(genomes))
+        hits = np.zeros(len(genomes), dtype=bool)
+        for i, key in enumerate(self.keys(genomes)):
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+                values[i] = value
+                hits[i] = True
+        self.hits += int(np.count_nonzero(hits))
+        return values, hits
+
+    def evaluate(self, genomes, compute):
+        """
+        Zwraca wektor przystosowań; compute wywoływane jest tylko dla genomów,
+        których nie ma w pamięci (każdy unikalny klucz liczony raz).
+        """
+        values, pending = self.split(genomes)
+        if pending:
+            first = [rows[0] for rows in pending.values()]
+            self.fill(values, pending, compute(genomes[first]))
+        return values
+
+    def split(self, genomes):
+        """
+        Pierwsza połowa evaluate: zwraca (wartości, {klucz: wiersze}) - wartości genomów
+        z pamięci oraz wiersze brakujących genomów pogrupowane po kluczu.
+        """
+        keys = self.keys(genomes)
+        values = np.empty(len(keys))
+        pending = {}
+
+        for i, key in enumerate(keys):
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+                values[i] = value
+                self.hits += 1
+            elif key in pending:
+                pending[key].append(i)
+                self.hits += 1
+            else:
+                pending[key] = [i]
+                self.misses += 1
+
+        return values, pending
+
+    def fill(self, values, pending, computed):
+        """
+        Druga połowa evaluate: wpisuje policzone wartości (po jednej na klucz z pending,
+        w tej samej kolejności) do values i do pamięci.
+        """
+        for (key, rows), value in zip(pending.items(), computed):
+            values[rows] = value
+            self.store(key, float(value))
+        return values
+
+    def store(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        return {"cache_hits": self.hits, "cache_misses": self.misses}
@@ -1,29 +1,54 @@
-from algorithms.config import config
+from algorithms.config import config, freeze
 from algorithms.fitness import evaluate_fitness
 from algorithms.population import Population
-from algorithms.BatchTester import BatchTester
+from algorithms.array_population import ArrayPopulation
 from apps.plotter import Plotter
-from algorithms.batch_plotter import show_results_window
 import time
-import pandas as pd
 
 
-def run_genetic_algorithm():
-    bounds = (config.range_start, config.range_end)
+def run_genetic_algorithm(config_obj=config, progress=None, cancel_event=None):
+    """
+    progress(gen, best_fitness, avg_fitness) jest wywoływane po każdym pokoleniu,
+    a ustawienie cancel_event (threading.Event) kończy przebieg między pokoleniami.
+    Model wyspowy nie obsługuje progress ani cancel_event. Zmiany globalnego config
+    w trakcie przebiegu nie mają na niego wpływu - przebieg działa na zamrożonej kopii.
+    """
+    config_obj = freeze(config_obj)
+    if config_obj.engine == "islands":
+        from algorithms.islands import run_island_model
+        return run_island_model(config_obj)
+
+    bounds = (config_obj.range_start, config_obj.range_end)
     plotter = Plotter()
     start_time = time.time()
 
-    population = Population(config)
+    if config_obj.engine == "array":
+        population = ArrayPopulation(config_obj)
+    else:
+        population = Population(config_obj)
+    population.stopping.cancel_event = cancel_event
 
     population.evaluate_all(evaluate_fitness, bounds)
 
     plotter.update_history(population.best_individual.fitness, population.avg_fitness_history[0])
     print(f"Epoka 0, najlepsze przystosowanie: {population.best_individual.fitness}")
 
-    best_individual, best_fitness_history, avg_fitness_history = population.run(evaluate_fitness, bounds)
+    on_generation = None
+    if progress is not None:
+        def on_generation(gen):
+            progress(gen, population.best_fitness_history[-1], population.avg_fitness_history[-1])
+
+    best_individual, best_fitness_history, avg_fitness_history = population.run(evaluate_fitness, bounds,
+                                                                                on_generation=on_generation)
+    if progress is not None:
+        # Ostatnia ocena (po ostatniej epoce lub przy zatrzymaniu) nie przechodzi przez on_generation
+        progress(population.generation, best_fitness_history[-1], avg_fitness_history[-1])
 
     for i in range(1, len(best_fitness_history)):
         plotter.update_history(best_fitness_history[i], avg_fitness_history[i])
+    plotter.update_stats(stop_reason=population.stop_reason, generations=population.generation,
+                         **population.evaluator.stats(),
+                         **population.profiler.stats(population.evaluator.evaluations))
 
     end_time = time.time()
     execution_time = end_time - start_time
@@ -33,39 +58,9 @@ def run_genetic_algorithm():
     return best_individual, execution_time, plotter
 
 
-def run_batch():
-    param_grid_ga = {
-        "range_start": [-20],
-        "range_end": [20],
-        "epochs": [100,200,500],
-        "population_size": [50, 100, 150],
-        "precision": [5],
-        "num_variables": [2],
-        "selection_method": ["tournament"],
-        "best_selection_amount": [2],
-        "tournament_size": [3],
-        "crossover_method": ["arithmetic"],
-        "crossover_probability": [0.7],
-        "mutation_method": ["uniform"],
-        "mutation_probability": [0.05],
-        "optimization_type": ["min"],
-    }
-
-    param_grid_gjo = {
-        "range_start": [-20],
-        "range_end": [20],
-        "epochs": [100,200,500],
-        "population_size": [50, 100, 150],
-        "precision": [5],
-        "num_variables": [2],
-        "optimization_type": ["min"],
-    }
-
-    tester = BatchTester(plotter_class=Plotter)
-    tester.run_batch(param_grid_ga, param_grid_gjo, repeats=5)
-
-    df = pd.DataFrame(tester.results)
-    df.to_csv("results/batch_results.csv", index=False)
-    print(df.groupby(["algorithm", "population_size"])["best_fitness"].agg(["mean", "std"]))
+def run_batch(resume=False, workers=None, repeats=None, show=True, experiment_path=None, stack_repeats=None,
+              plots=None, preview=None):
+    from algorithms.experiment import DEFAULT_EXPERIMENT, run_experiment
 
-    show_results_window(tester.results)
+    return run_experiment(experiment_path or DEFAULT_EXPERIMENT, resume=resume, workers=workers,
+                          repeats=repeats, show=show, stack_repeats=stack_repeats, plots=plots, preview=preview)
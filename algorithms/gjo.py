@@ -1,35 +1,51 @@
 import numpy as np
 import random
 import math
+from functools import lru_cache
 from algorithms.individual import Individual
+from algorithms.array_population import make_individual
 from algorithms.fitness import evaluate_fitness
-from algorithms.config import config
+from algorithms.evaluator import make_evaluator
+from algorithms.surrogate import true_mean
+from algorithms.stopping import StopCriteria
+from algorithms.profiler import make_profiler
+from algorithms.rng import make_rng, make_random
+from algorithms.config import config, freeze
 import time
 
 
+@lru_cache(maxsize=None)
+def levy_sigma(beta=1.5):
+    """
+    Odchylenie standardowe Mantegny dla kroku Levy flight (liczone raz dla danego beta)
+    """
+    return (math.gamma(1 + beta) * math.sin(math.pi * beta / 2) /
+            (math.gamma((1 + beta) / 2) * beta * (2 ** ((beta - 1) / 2)))) ** (1 / beta)
+
+
 class GoldenJackal:
 
-    def __init__(self, num_variables, bounds):
+    def __init__(self, num_variables, bounds, rng=random):
         self.num_variables = num_variables
         self.bounds = bounds
-        self.position = [random.uniform(bounds[0], bounds[1]) for _ in range(num_variables)]
+        self.position = [rng.uniform(bounds[0], bounds[1]) for _ in range(num_variables)]
         self.fitness = float('inf')
+        self.dirty = True
+        self.predicted = False
         
-    def evaluate(self, fitness_func):
-        individual = Individual(num_variables=self.num_variables, precision=5, random_init=False)
-        individual.chromosome_values = self.position.copy()
-        self.fitness = fitness_func(individual)
-        return self.fitness
-    
     def update_position(self, new_position, bounds):
-        self.position = [max(bounds[0], min(bounds[1], pos)) for pos in new_position]
+        position = [max(bounds[0], min(bounds[1], pos)) for pos in new_position]
+        if position != self.position:
+            self.position = position
+            self.dirty = True
 
 
 class GJOAlgorithm:
 
     
-    def __init__(self, config_obj=config):
-        self.config = config_obj
+    def __init__(self, config_obj=config, random=None):
+        self.config = config_obj = freeze(config_obj)
+        self.random = random if random is not None else make_random(config_obj.seed)
         self.population_size = config_obj.population_size
         self.num_variables = config_obj.num_variables
         self.max_iterations = config_obj.epochs
@@ -44,38 +60,51 @@ class GJOAlgorithm:
 
         self.best_fitness_history = []
         self.avg_fitness_history = []
-        
+        self.evaluator = make_evaluator(config_obj)
+        self.stopping = StopCriteria(config_obj)
+        self.stop_reason = None
+        self.iteration = 0
+        self.profiler = make_profiler(config_obj)
+
     def initialize_population(self):
         self.population = []
         for _ in range(self.population_size):
-            jackal = GoldenJackal(self.num_variables, self.bounds)
+            jackal = GoldenJackal(self.num_variables, self.bounds, self.random)
             self.population.append(jackal)
             
     def evaluate_population(self, fitness_func):
-        for jackal in self.population:
-            jackal.evaluate(fitness_func)
+        with self.profiler.phase("evaluation"):
+            dirty = [jackal for jackal in self.population if jackal.dirty]
+            if dirty:
+                positions = np.array([jackal.position for jackal in dirty], dtype=float)
+                values = self.evaluator.evaluate(fitness_func, positions)
+                for jackal, value, predicted in zip(dirty, values, self.evaluator.last_predicted):
+                    jackal.fitness = float(value)
+                    jackal.predicted = bool(predicted)
+                    jackal.dirty = False
 
-        if self.config.optimization_type == "max":
-            self.population.sort(key=lambda x: x.fitness, reverse=True)
-        else:
-            self.population.sort(key=lambda x: x.fitness)
+        with self.profiler.phase("history"):
+            if self.config.optimization_type == "max":
+                self.population.sort(key=lambda x: x.fitness, reverse=True)
+            else:
+                self.population.sort(key=lambda x: x.fitness)
 
-        self.best_jackal = self.population[0]
-        self.second_best_jackal = self.population[1]
+            self.best_jackal = self.population[0]
+            self.second_best_jackal = self.population[1]
 
-        avg_fitness = sum(jackal.fitness for jackal in self.population) / self.population_size
-        self.best_fitness_history.append(self.best_jackal.fitness)
-        self.avg_fitness_history.append(avg_fitness)
+            avg_fitness = true_mean(np.array([jackal.fitness for jackal in self.population]),
+                                    np.array([jackal.predicted for jackal in self.population]))
+            self.best_fitness_history.append(self.best_jackal.fitness)
+            self.avg_fitness_history.append(avg_fitness)
         
     def levy_flight(self, beta=1.5):
         """
         Generowanie kroku Levy flight dla eksploracji
         """
-        sigma = (math.gamma(1 + beta) * math.sin(math.pi * beta / 2) /
-                (math.gamma((1 + beta) / 2) * beta * (2 ** ((beta - 1) / 2)))) ** (1 / beta)
-        
-        u = np.random.normal(0, sigma)
-        v = np.random.normal(0, 1)
+        sigma = levy_sigma(beta)
+
+        u = self.random.gauss(0, sigma)
+        v = self.random.gauss(0, 1)
         step = u / abs(v) ** (1 / beta)
         return step
         
@@ -90,11 +119,11 @@ class GJOAlgorithm:
             new_position = [0] * self.num_variables
             
             for j in range(self.num_variables):
-                r1, r2, r3, r4 = [random.random() for _ in range(4)]
+                r1, r2, r3, r4 = [self.random.random() for _ in range(4)]
 
-                if random.random() < 0.5:
+                if self.random.random() < 0.5:
 
-                    if random.random() < 0.5:
+                    if self.random.random() < 0.5:
                         levy_step = self.levy_flight()
                         new_position[j] = self.best_jackal.position[j] + levy_step * abs(
                             self.best_jackal.position[j] - jackal.position[j])
@@ -112,60 +141,202 @@ class GJOAlgorithm:
                         new_position[j] = (X1 + X2) / 2
                 else:
                     if abs(a) < 1:
-                        RL = 0.05 * random.gauss(0, 1)  # Levy random walk
+                        RL = 0.05 * self.random.gauss(0, 1)  # Levy random walk
                         new_position[j] = (self.best_jackal.position[j] + 
                                          self.second_best_jackal.position[j]) / 2 + RL
                     else:
-                        rand_jackal = random.choice(self.population)
-                        new_position[j] = rand_jackal.position[j] + random.uniform(-1, 1) * abs(
+                        rand_jackal = self.random.choice(self.population)
+                        new_position[j] = rand_jackal.position[j] + self.random.uniform(-1, 1) * abs(
                             rand_jackal.position[j] - jackal.position[j])
             
 
             jackal.update_position(new_position, self.bounds)
             
-    def run(self, fitness_func=evaluate_fitness):
+    def best_fitness(self):
+        return self.best_jackal.fitness
+
+    def best_solution(self):
+        best_individual = Individual(num_variables=self.num_variables, precision=5, random_init=False)
+        best_individual.chromosome_values = self.best_jackal.position.copy()
+        best_individual.fitness = self.best_jackal.fitness
+        return best_individual
+
+    def run(self, fitness_func=evaluate_fitness, on_generation=None):
+        """
+        on_generation(iteration) jest wywoływane po ocenie każdej iteracji.
+        """
 
         print("Rozpoczynanie algorytmu Golden Jackal Optimization...")
         start_time = time.time()
 
-        self.initialize_population()
+        with self.profiler.phase("initialization"):
+            self.initialize_population()
 
         self.evaluate_population(fitness_func)
-        print(f"Iteracja 0, najlepsze przystosowanie: {self.best_jackal.fitness}")
+        print(f"Iteracja 0, najlepsze przystosowanie: {self.best_fitness()}")
 
+        self.stop_reason = "epochs"
         for iteration in range(1, self.max_iterations + 1):
-            self.update_positions(iteration)
+            with self.profiler.phase("stopping"):
+                reason = self.stopping.check(self.best_fitness(), self.evaluator.evaluations)
+            if reason is not None:
+                self.stop_reason = reason
+                print(f"Zatrzymano w iteracji {self.iteration}: {reason}")
+                break
+
+            with self.profiler.phase("position_update"):
+                self.update_positions(iteration)
 
             self.evaluate_population(fitness_func)
+            self.iteration = iteration
+
+            if on_generation is not None:
+                on_generation(iteration)
 
             if iteration % 10 == 0:
-                print(f"Iteracja {iteration}, najlepsze przystosowanie: {self.best_jackal.fitness}")
+                print(f"Iteracja {iteration}, najlepsze przystosowanie: {self.best_fitness()}")
         
+        self.evaluator.close()
         end_time = time.time()
         execution_time = end_time - start_time
         
         print(f"Algorytm GJO zakończony. Czas wykonania: {execution_time:.2f} sekund")
 
-        best_individual = Individual(num_variables=self.num_variables, precision=5, random_init=False)
-        best_individual.chromosome_values = self.best_jackal.position.copy()
-        best_individual.fitness = self.best_jackal.fitness
-        
-        return best_individual, self.best_fitness_history, self.avg_fitness_history, execution_time
+        return self.best_solution(), self.best_fitness_history, self.avg_fitness_history, execution_time
+
+
+class ArrayGJOAlgorithm(GJOAlgorithm):
+    """
+    Wariant GJO, w którym pozycje szakali tworzą macierz (N x D), a cała aktualizacja
+    eksploracji/eksploatacji, kroki Levy i przycinanie do granic są operacjami tablicowymi.
+    """
+
+    def __init__(self, config_obj=config, rng=None):
+        super().__init__(config_obj)
+        self.rng = rng if rng is not None else make_rng(config_obj.seed)
+        self.positions = None
+        self.fitness = None
+        self.dirty = None
+        self.predicted = None
+        self.best_index = None
+        self.second_best_index = None
 
+    def initialize_population(self):
+        self.positions = self.rng.uniform(self.bounds[0], self.bounds[1],
+                                          size=(self.population_size, self.num_variables))
+        self.fitness = np.full(self.population_size, np.inf)
+        self.dirty = np.ones(self.population_size, dtype=bool)
+        self.predicted = np.zeros(self.population_size, dtype=bool)
+
+    def evaluate_population(self, fitness_func):
+        with self.profiler.phase("evaluation"):
+            dirty = np.flatnonzero(self.dirty)
+            if dirty.size:
+                self.fitness[dirty] = self.evaluator.evaluate(fitness_func, self.positions[dirty])
+                self.predicted[dirty] = self.evaluator.last_predicted
+                self.dirty[dirty] = False
+
+        with self.profiler.phase("history"):
+            keys = -self.fitness if self.config.optimization_type == "max" else self.fitness
+            top = np.argpartition(keys, 1)[:2] if self.population_size > 2 else np.arange(self.population_size)
+            top = top[np.argsort(keys[top], kind="stable")]
+            self.best_index = int(top[0])
+            self.second_best_index = int(top[-1])
+
+            self.best_fitness_history.append(float(self.fitness[self.best_index]))
+            self.avg_fitness_history.append(true_mean(self.fitness, self.predicted))
+
+    def levy_steps(self, shape, beta=1.5):
+        u = self.rng.normal(0.0, levy_sigma(beta), size=shape)
+        v = self.rng.normal(0.0, 1.0, size=shape)
+        return u / np.abs(v) ** (1 / beta)
+
+    def update_positions(self, iteration):
+
+        a = 2 - 2 * iteration / self.max_iterations
+
+        positions = self.positions
+        shape = positions.shape
+        best = positions[self.best_index]
+        second_best = positions[self.second_best_index]
+
+        explore = self.rng.random(shape) < 0.5
+        levy = self.rng.random(shape) < 0.5
 
-def run_gjo_algorithm():
+        new_positions = np.empty(shape)
+
+        levy_mask = explore & levy
+        if levy_mask.any():
+            step = self.levy_steps(shape)
+            candidate = best + step * np.abs(best - positions)
+            new_positions[levy_mask] = candidate[levy_mask]
+
+        hunt_mask = explore & ~levy
+        if hunt_mask.any():
+            r1, r2, r3, r4 = self.rng.random((4,) + shape)
+            A1 = 2 * a * r1 - a
+            D_prey1 = np.abs(2 * r2 * best - positions)
+            A2 = 2 * a * r3 - a
+            D_prey2 = np.abs(2 * r4 * second_best - positions)
+            candidate = ((best - A1 * D_prey1) + (second_best - A2 * D_prey2)) / 2
+            new_positions[hunt_mask] = candidate[hunt_mask]
+
+        exploit_mask = ~explore
+        if exploit_mask.any():
+            if abs(a) < 1:
+                RL = 0.05 * self.rng.normal(0.0, 1.0, size=shape)
+                candidate = (best + second_best) / 2 + RL
+            else:
+                rows = self.rng.integers(0, self.population_size, size=shape)
+                rand_positions = positions[rows, np.arange(shape[1])]
+                candidate = rand_positions + self.rng.uniform(-1, 1, size=shape) * np.abs(rand_positions - positions)
+            new_positions[exploit_mask] = candidate[exploit_mask]
+
+        np.clip(new_positions, self.bounds[0], self.bounds[1], out=new_positions)
+
+        leaders = [self.best_index, self.second_best_index]
+        new_positions[leaders] = positions[leaders]
+        self.dirty |= np.any(new_positions != positions, axis=1)
+        self.positions = new_positions
+
+    def best_fitness(self):
+        return float(self.fitness[self.best_index])
+
+    def best_solution(self):
+        return make_individual(self.positions[self.best_index], self.fitness[self.best_index], self.config.precision)
+
+
+def run_gjo_algorithm(config_obj=config, progress=None, cancel_event=None):
+    """
+    progress(iteration, best_fitness, avg_fitness) jest wywoływane po każdej iteracji,
+    a ustawienie cancel_event (threading.Event) kończy przebieg między iteracjami.
+    """
+    config_obj = freeze(config_obj)
 
     from apps.plotter import Plotter
     
-    bounds = (config.range_start, config.range_end)
+    bounds = (config_obj.range_start, config_obj.range_end)
     plotter = Plotter()
 
-    gjo = GJOAlgorithm(config)
-    best_individual, best_fitness_history, avg_fitness_history, execution_time = gjo.run(evaluate_fitness)
+    if config_obj.engine == "array":
+        gjo = ArrayGJOAlgorithm(config_obj)
+    else:
+        gjo = GJOAlgorithm(config_obj)
+    gjo.stopping.cancel_event = cancel_event
+
+    on_generation = None
+    if progress is not None:
+        def on_generation(iteration):
+            progress(iteration, gjo.best_fitness_history[-1], gjo.avg_fitness_history[-1])
+
+    best_individual, best_fitness_history, avg_fitness_history, execution_time = gjo.run(
+        evaluate_fitness, on_generation=on_generation)
 
     for i in range(len(best_fitness_history)):
         plotter.update_history(best_fitness_history[i], 
                              avg_fitness_history[i] if i < len(avg_fitness_history) else None)
+    plotter.update_stats(stop_reason=gjo.stop_reason, generations=gjo.iteration, **gjo.evaluator.stats(),
+                         **gjo.profiler.stats(gjo.evaluator.evaluations))
     
     print(f"Najlepsze rozwiązanie: {best_individual.chromosome_values}")
     print(f"Wartość funkcji celu: {best_individual.fitness}")
@@ -0,0 +1,144 @@
+import json
+import os
+import numpy as np
+
+
+def truncate_partial_line(path):
+    """
+    Obcina niedokończony ostatni wiersz pliku JSON Lines (przerwany zapis), aby kolejny
+    wpis nie został dopisany do fragmentu i nie zepsuł pełnego wiersza.
+    """
+    if not os.path.exists(path):
+        return
+
+    with open(path, "rb+") as file:
+        size = file.seek(0, os.SEEK_END)
+        position = size
+        while position > 0:
+            step = min(65536, position)
+            file.seek(position - step)
+            block = file.read(step)
+            newline = block.rfind(b"\n")
+            if newline != -1:
+                position = position - step + newline + 1
+                break
+            position -= step
+        if position != size:
+            file.truncate(position)
+
+
+class HistoryStore:
+    """
+    Binarny, kolumnowy zapis historii przystosowania dla całego eksperymentu.
+
+    Historie każdego przebiegu są dopisywane do surowych plików float (po jednym na
+    rodzaj historii), a indeks JSON Lines mapuje run_id na przesunięcie i długość.
+    Odczyt korzysta z np.memmap i zwraca macierz (przebiegi x generacje).
+    """
+
+    kinds = ("best", "avg")
+
+    def __init__(self, directory="results", name="batch_results", resume=False, dtype=np.float64):
+        self.directory = directory
+        self.dtype = np.dtype(dtype)
+        self.index_path = os.path.join(directory, f"{name}_history_index.jsonl")
+        self.data_paths = {kind: os.path.join(directory, f"{name}_{kind}.{self.dtype.name}") for kind in self.kinds}
+        self.npz_path = os.path.join(directory, f"{name}_histories.npz")
+        os.makedirs(directory, exist_ok=True)
+
+        if not resume:
+            for path in (self.index_path, self.npz_path, *self.data_paths.values()):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        self.run_ids = []
+        self.rows = {}
+        self.offsets = {kind: [] for kind in self.kinds}
+        self.lengths = {kind: [] for kind in self.kinds}
+        self.sizes = {kind: 0 for kind in self.kinds}
+        self.read_index()
+
+    def read_index(self):
+        if not os.path.exists(self.index_path):
+            return
+
+        truncate_partial_line(self.index_path)
+        with open(self.index_path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.add_entry(entry)
+
+        # Dane dopisane po ostatnim poprawnym wpisie indeksu (przerwany zapis) są nadpisywane
+        for kind, path in self.data_paths.items():
+            if os.path.exists(path):
+                with open(path, "r+b") as file:
+                    file.truncate(self.sizes[kind] * self.dtype.itemsize)
+
+    def add_entry(self, entry):
+        run_id = entry["run_id"]
+        row = self.rows.get(run_id)
+        if row is None:
+            self.rows[run_id] = len(self.run_ids)
+            self.run_ids.append(run_id)
+
+        for kind in self.kinds:
+            offset, length = entry[kind]
+            if row is None:
+                self.offsets[kind].append(offset)
+                self.lengths[kind].append(length)
+            else:
+                # Przebieg powtórzony po wznowieniu (historia bez wiersza wyniku) - nowsza historia zastępuje starą
+                self.offsets[kind][row] = offset
+                self.lengths[kind][row] = length
+            self.sizes[kind] = offset + length
+
+    def append(self, run_id, best_history, avg_history):
+        entry = {"run_id": run_id}
+        for kind, history in zip(self.kinds, (best_history, avg_history)):
+            values = np.asarray(history, dtype=self.dtype)
+            with open(self.data_paths[kind], "ab") as file:
+                file.write(values.tobytes())
+            entry[kind] = [self.sizes[kind], int(values.size)]
+
+        with open(self.index_path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(entry) + "\n")
+
+        self.add_entry(entry)
+
+    def history(self, run_id, kind="best"):
+        row = self.rows[run_id]
+        data = self.memmap(kind)
+        offset = self.offsets[kind][row]
+        return np.array(data[offset:offset + self.lengths[kind][row]])
+
+    def memmap(self, kind):
+        if self.sizes[kind] == 0:
+            return np.empty(0, dtype=self.dtype)
+        return np.memmap(self.data_paths[kind], dtype=self.dtype, mode="r", shape=(self.sizes[kind],))
+
+    def matrix(self, kind="best", pad="nan"):
+        """
+        Zwraca macierz (przebiegi x generacje) w kolejności self.run_ids. Krótsze historie
+        (np. po wczesnym zatrzymaniu) są dopełniane wartością NaN albo ostatnią wartością (pad="edge").
+        """
+        lengths = np.asarray(self.lengths[kind], dtype=np.int64)
+        if lengths.size == 0:
+            return np.empty((0, 0), dtype=self.dtype)
+
+        offsets = np.asarray(self.offsets[kind], dtype=np.int64)
+        columns = np.arange(lengths.max())
+        positions = offsets[:, None] + np.minimum(columns, np.maximum(lengths - 1, 0)[:, None])
+        matrix = self.memmap(kind)[positions]
+
+        if pad == "nan":
+            matrix = matrix.astype(self.dtype, copy=False)
+            matrix[columns >= lengths[:, None]] = np.nan
+        return matrix
+
+    def save_npz(self):
+        np.savez(self.npz_path, run_ids=np.array(self.run_ids),
+                 **{kind: self.matrix(kind) for kind in self.kinds})
+        return self.npz_path
@@ -1,42 +1,32 @@
 from algorithms.chromosome import Chromosome
-from algorithms.config import config
 import random
 from algorithms.mutation import mutate_uniform, mutate_gaussian
 
 
 class Individual:
-    def __init__(self, num_variables=2, precision=10, random_init=True):
+    def __init__(self, num_variables=2, precision=10, random_init=True, rng=random, bounds=None):
         self.num_variables = num_variables
         self.precision = precision
-        self.chromosomes = [Chromosome(num_genes=self.num_variables, random_init=random_init)]
+        a, b = bounds if bounds is not None else (-20, 20)
+        self.chromosomes = [Chromosome(num_genes=self.num_variables, a=a, b=b, random_init=random_init, rng=rng)]
         self.fitness = float('inf')
         self.chromosome_values = []
+        self.dirty = True
+        self.predicted = False
 
-    def evaluate(self, fitness_func=None, bounds=None):
-        self.chromosome_values = []
-
-        for i in range(self.num_variables):
-            value = self.chromosomes[0][i]
-            self.chromosome_values.append(value)
-
-        if fitness_func:
-            self.fitness = fitness_func(self)
-        else:
-            from algorithms.fitness import evaluate_fitness
-            self.fitness = evaluate_fitness(self)
-
-        return self.fitness
-
-    def apply_mutation(self, mutation_rate=0.3, method="uniform"):
+    def apply_mutation(self, mutation_rate, method, bounds, sigma=1.0, rng=random):
         chromosome = self.chromosomes[0].chromosome
+        a, b = bounds
 
         for i in range(len(chromosome)):
-            if random.random() < mutation_rate:
+            if rng.random() < mutation_rate:
+                self.dirty = True
                 if method == "uniform":
 
-                    mutate_uniform(chromosome, i)
+                    mutate_uniform(chromosome, i, a, b, rng)
                 elif method == "gaussian":
 
-                    mutate_gaussian(chromosome, i)
+                    gene_sigma = sigma[i] if hasattr(sigma, "__len__") else sigma
+                    mutate_gaussian(chromosome, i, gene_sigma, a, b, rng)
                 else:
                     print(f"Ostrzeżenie: Nieznana metoda mutacji: {method}")
\ No newline at end of file
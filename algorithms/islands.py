@@ -0,0 +1,217 @@
+import multiprocessing
+import queue
+import threading
+import time
+import traceback
+from collections import deque
+import numpy as np
+from algorithms.config import config
+from algorithms.fitness import evaluate_fitness
+from algorithms.array_population import ArrayPopulation, make_individual
+
+
+def migration_targets(index, num_islands, topology="ring"):
+    """
+    Wyspy, do których wyspa `index` wysyła emigrantów.
+    """
+    if num_islands < 2:
+        return []
+    if topology == "ring":
+        return [(index + 1) % num_islands]
+    if topology == "full":
+        return [target for target in range(num_islands) if target != index]
+    raise ValueError(f"Unknown migration topology: {topology}")
+
+
+def migration_sources(index, num_islands, topology="ring"):
+    return [source for source in range(num_islands)
+            if index in migration_targets(source, num_islands, topology)]
+
+
+class Migration:
+    """
+    Wymiana osobników jednej wyspy z sąsiadami. Co migration_interval pokoleń wysyła
+    migration_size najlepszych genomów (tablice NumPy, nie obiekty Individual) do wysp
+    docelowych i czeka na przybyszów od aktywnych sąsiadów; wyspa, która zakończyła
+    działanie, wysyła (index, None, None) i przestaje być oczekiwana.
+    """
+
+    def __init__(self, index, population, inboxes, config_obj=config):
+        self.index = index
+        self.population = population
+        self.inboxes = inboxes
+        self.interval = config_obj.migration_interval
+        self.size = config_obj.migration_size
+        self.targets = migration_targets(index, len(inboxes), config_obj.migration_topology)
+        self.active = set(migration_sources(index, len(inboxes), config_obj.migration_topology))
+        self.buffered = {source: deque() for source in self.active}
+        self.migrations = 0
+        self.immigrants = 0
+
+    def __call__(self, gen):
+        if gen == 0 or not self.interval or gen % self.interval or not self.targets:
+            return
+
+        genomes, fitness = self.population.emigrants(self.size)
+        for target in self.targets:
+            self.inboxes[target].put((self.index, genomes, fitness))
+
+        received = self.receive()
+        if received:
+            self.population.immigrate(np.concatenate([genomes for genomes, _ in received]),
+                                      np.concatenate([fitness for _, fitness in received]))
+            self.immigrants += sum(len(fitness) for _, fitness in received)
+        self.migrations += 1
+
+    def receive(self):
+        received = []
+        waiting = set(self.active)
+        inbox = self.inboxes[self.index]
+        while True:
+            for source in list(waiting):
+                if self.buffered[source]:
+                    received.append(self.buffered[source].popleft())
+                    waiting.discard(source)
+            if not waiting:
+                return received
+
+            source, genomes, fitness = inbox.get()
+            if genomes is None:
+                self.active.discard(source)
+                waiting.discard(source)
+            else:
+                self.buffered[source].append((genomes, fitness))
+
+    def finish(self):
+        for target in self.targets:
+            self.inboxes[target].put((self.index, None, None))
+            # Wiadomości do wysp, które już skończyły, nie zostaną odebrane - nie czekamy na nie przy wyjściu
+            if hasattr(self.inboxes[target], "cancel_join_thread"):
+                self.inboxes[target].cancel_join_thread()
+
+
+def run_island(index, config_obj, seed, inboxes, results):
+    """
+    Wykonuje jedną wyspę i zawsze odkłada do results jeden wpis - wynik albo
+    {"island", "error"} z pełnym traceback, tak aby run_islands nie czekał w nieskończoność.
+    """
+    result = {"island": index, "error": "Island finished without a result"}
+    migration = None
+    try:
+        population = ArrayPopulation(config_obj, np.random.default_rng(seed))
+        migration = Migration(index, population, inboxes, config_obj)
+        population.run(evaluate_fitness, on_generation=migration)
+        result = {
+            "island": index,
+            "best_fitness": population.best_individual.fitness,
+            "best_solution": population.best_individual.chromosome_values,
+            "best_fitness_history": population.best_fitness_history,
+            "avg_fitness_history": population.avg_fitness_history,
+            "stop_reason": population.stop_reason,
+            "generations": population.generation,
+            "migrations": migration.migrations,
+            "immigrants": migration.immigrants,
+            **population.evaluator.stats(),
+            **population.profiler.stats(population.evaluator.evaluations),
+        }
+    except Exception:
+        result = {"island": index, "error": traceback.format_exc()}
+    finally:
+        if migration is not None:
+            migration.finish()
+        else:
+            # Wyspa bez obiektu Migration i tak musi zwolnić sąsiadów czekających na jej emigrantów
+            for target in migration_targets(index, len(inboxes), config_obj.migration_topology):
+                inboxes[target].put((index, None, None))
+        results.put(result)
+
+
+def run_islands(config_obj=config, processes=True):
+    """
+    Uruchamia config.islands niezależnych populacji ArrayPopulation (każda w osobnym
+    procesie albo, przy processes=False, wątku) z okresową migracją najlepszych osobników.
+    Zwraca listę wyników wysp posortowaną po numerze wyspy.
+    """
+    num_islands = config_obj.islands
+    seeds = np.random.SeedSequence(config_obj.seed).spawn(num_islands)
+
+    if processes:
+        inboxes = [multiprocessing.Queue() for _ in range(num_islands)]
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=run_island,
+                                           args=(index, config_obj, seeds[index], inboxes, results))
+                   for index in range(num_islands)]
+    else:
+        inboxes = [queue.Queue() for _ in range(num_islands)]
+        results = queue.Queue()
+        workers = [threading.Thread(target=run_island, args=(index, config_obj, seeds[index], inboxes, results))
+                   for index in range(num_islands)]
+
+    for worker in workers:
+        worker.start()
+    islands = [results.get() for _ in range(num_islands)]
+    for worker in workers:
+        worker.join()
+
+    failed = [island for island in islands if "error" in island]
+    if failed:
+        details = "\n".join(f"Wyspa {island['island']}:\n{island['error']}" for island in failed)
+        raise RuntimeError(f"{len(failed)} island(s) failed:\n{details}")
+
+    return sorted(islands, key=lambda island: island["island"])
+
+
+def combine_histories(histories, reduce):
+    """
+    Łączy historie wysp pokolenie po pokoleniu; krótsze (zatrzymane wcześniej) historie
+    są przedłużane ostatnią wartością.
+    """
+    length = max(len(history) for history in histories)
+    padded = np.array([history + [history[-1]] * (length - len(history)) for history in histories])
+    return reduce(padded, axis=0).tolist()
+
+
+def run_island_model(config_obj=config):
+    from apps.plotter import Plotter
+
+    plotter = Plotter()
+    start_time = time.time()
+
+    # Procesy robocze puli BatchTester są demonami i nie mogą tworzyć własnych procesów
+    processes = config_obj.island_backend == "process" and not multiprocessing.current_process().daemon
+    islands = run_islands(config_obj, processes=processes)
+
+    select = max if config_obj.optimization_type == "max" else min
+    best_island = select(islands, key=lambda island: island["best_fitness"])
+    best_individual = make_individual(best_island["best_solution"], best_island["best_fitness"],
+                                      config_obj.precision)
+
+    reduce = np.max if config_obj.optimization_type == "max" else np.min
+    best_fitness_history = combine_histories([island["best_fitness_history"] for island in islands], reduce)
+    avg_fitness_history = combine_histories([island["avg_fitness_history"] for island in islands], np.mean)
+    for best_fitness, avg_fitness in zip(best_fitness_history, avg_fitness_history):
+        plotter.update_history(best_fitness, avg_fitness)
+
+    plotter.island_histories = [
+        {key: island[key] for key in ("island", "best_fitness_history", "avg_fitness_history")}
+        for island in islands
+    ]
+    plotter.update_stats(
+        islands=len(islands),
+        best_island=best_island["island"],
+        stop_reason=best_island["stop_reason"],
+        generations=max(island["generations"] for island in islands),
+        migrations=sum(island["migrations"] for island in islands),
+        immigrants=sum(island["immigrants"] for island in islands),
+        evaluations=sum(island["evaluations"] for island in islands),
+        **({"surrogate_evaluations": sum(island["surrogate_evaluations"] for island in islands)}
+           if config_obj.surrogate else {}),
+    )
+
+    for island in islands:
+        print(f"Wyspa {island['island']}: najlepsze przystosowanie {island['best_fitness']}, "
+              f"pokolenia {island['generations']}, migracje {island['migrations']}")
+
+    execution_time = time.time() - start_time
+    print(f"Czas wykonania modelu wyspowego: {execution_time:.2f} sekund")
+    return best_individual, execution_time, plotter
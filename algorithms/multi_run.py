@@ -0,0 +1,454 @@
+import math
+import time
+import numpy as np
+from algorithms.config import config, freeze
+from algorithms.fitness import evaluate_fitness
+from algorithms.crossover import BATCH_CROSSOVER_METHODS, arithmetic_crossover_batch
+from algorithms.selection import selection_weights
+from algorithms.evaluator import make_evaluator
+from algorithms.fitness_cache import FitnessCache
+from algorithms.stopping import StopCriteria
+from algorithms.profiler import make_profiler
+from algorithms.array_population import make_individual
+from algorithms.gjo import levy_sigma
+from algorithms.rng import make_rng
+
+
+class StackedGenerator:
+    """
+    R niezależnych generatorów widzianych jako jeden. Losowanie o kształcie (R, ...)
+    bierze i-ty wiersz z i-tego generatora, więc przebieg zależy wyłącznie od własnego strumienia.
+
+    Liczby z [0, 1) są pobierane z generatorów blokami (R x block_size) i wydawane
+    kolejnymi wycinkami; liczby całkowite i jednostajne powstają z nich arytmetycznie,
+    więc takie losowanie to jedna operacja na tablicy, a nie R wywołań. Rozkład normalny
+    jest losowany bezpośrednio z każdego generatora (ziggurat jest szybszy niż Box-Muller).
+    """
+
+    def __init__(self, rngs, block_size=65536):
+        self.rngs = list(rngs)
+        self.block_size = block_size
+        self.buffer = np.empty((len(self.rngs), 0))
+        self.position = 0
+
+    def uniforms(self, count):
+        if self.position + count > self.buffer.shape[1]:
+            fresh = np.stack([rng.random(max(self.block_size, count)) for rng in self.rngs])
+            self.buffer = np.concatenate([self.buffer[:, self.position:], fresh], axis=1)
+            self.position = 0
+        values = self.buffer[:, self.position:self.position + count]
+        self.position += count
+        return values
+
+    def shape(self, size):
+        size = (size,) if np.isscalar(size) else tuple(size)
+        if size[0] != len(self.rngs):
+            raise ValueError(f"Leading dimension {size[0]} does not match {len(self.rngs)} runs")
+        return size
+
+    def random(self, size):
+        size = self.shape(size)
+        return self.uniforms(math.prod(size[1:])).reshape(size)
+
+    def integers(self, low, high, size):
+        return low + (self.random(size) * (high - low)).astype(np.int64)
+
+    def uniform(self, low, high, size):
+        return low + (high - low) * self.random(size)
+
+    def normal(self, loc, scale, size):
+        size = self.shape(size)
+        return loc + scale * np.stack([rng.standard_normal(size[1:]) for rng in self.rngs])
+
+
+def spawn_generators(runs, seed=None):
+    return [make_rng(child) for child in np.random.SeedSequence(seed).spawn(runs)]
+
+
+def take_rows(values, indices):
+    """
+    values (R x N [x D]), indices (R x M) -> wiersze values[r, indices[r]] dla każdego przebiegu.
+    """
+    return values[np.arange(len(indices))[:, None], indices]
+
+
+def best_indices_stacked(fitness, num_selected, optimization_type="min"):
+    keys = -fitness if optimization_type == "max" else fitness
+    runs, size = keys.shape
+    num_selected = min(num_selected, size)
+    if num_selected < size:
+        candidates = np.argpartition(keys, num_selected - 1, axis=1)[:, :num_selected]
+    else:
+        candidates = np.tile(np.arange(size), (runs, 1))
+    order = np.argsort(take_rows(keys, candidates), axis=1, kind="stable")
+    return take_rows(candidates, order)
+
+
+def tournament_indices_stacked(fitness, num_selected, tournament_size, optimization_type, rng):
+    runs, size = fitness.shape
+    contestants = rng.integers(0, size, size=(runs, num_selected, tournament_size))
+    scores = take_rows(fitness, contestants.reshape(runs, -1)).reshape(contestants.shape)
+    winners = np.argmax(scores, axis=2) if optimization_type == "max" else np.argmin(scores, axis=2)
+    return np.take_along_axis(contestants, winners[..., None], axis=2)[..., 0]
+
+
+def search_rows(fitness, pointers, optimization_type):
+    """
+    searchsorted wiersz po wierszu w jednym wywołaniu: skumulowane wagi każdego przebiegu są
+    normalizowane do [0, 1] i przesuwane o numer przebiegu, a wskaźniki (z [0, 1)) tak samo.
+    """
+    runs, size = fitness.shape
+    cumulative = np.cumsum([selection_weights(row, optimization_type) for row in fitness], axis=1)
+    offsets = np.arange(runs)[:, None]
+    flat = (cumulative / cumulative[:, -1:] + offsets).ravel()
+    indices = np.searchsorted(flat, (pointers + offsets).ravel(), side="right").reshape(runs, -1)
+    return (indices - offsets * size).clip(0, size - 1)
+
+
+def roulette_indices_stacked(fitness, num_selected, optimization_type, rng):
+    return search_rows(fitness, rng.random((fitness.shape[0], num_selected)), optimization_type)
+
+
+def sus_indices_stacked(fitness, num_selected, optimization_type, rng):
+    start = rng.random((fitness.shape[0],))[:, None]
+    return search_rows(fitness, (start + np.arange(num_selected)) / num_selected, optimization_type)
+
+
+def mutate_stacked(genomes, mutation_rate, method="uniform", bounds=(-20, 20), sigma=1.0, rng=None):
+    """
+    Mutacja tensora genomów (R x N x D). W odróżnieniu od mutate_population losuje wartości
+    dla wszystkich genów (a nie tylko zmutowanych), dzięki czemu każdy przebieg zużywa
+    liczby ze swojego strumienia w stałych porcjach, niezależnie od pozostałych przebiegów.
+    """
+    a, b = bounds
+    mask = rng.random(genomes.shape) < mutation_rate
+
+    if method == "uniform":
+        values = rng.uniform(a, b, size=genomes.shape)
+    elif method == "gaussian":
+        sigma = np.asarray(sigma, dtype=float)
+        values = np.clip(genomes + rng.normal(0.0, 1.0, size=genomes.shape) * sigma, a, b)
+    else:
+        print(f"Ostrzeżenie: Nieznana metoda mutacji: {method}")
+        return genomes
+
+    return np.where(mask, values, genomes)
+
+
+class StackedRuns:
+    """
+    Wspólna część silników wieloprzebiegowych: R niezależnych przebiegów tego samego
+    algorytmu z tą samą konfiguracją, przechowywanych jako tensory (R x N x D).
+    Każdy przebieg ma własny generator, własne kryteria stopu i własną historię;
+    ocena funkcji celu obejmuje naraz wszystkie zmienione genomy wszystkich przebiegów.
+    """
+
+    def __init__(self, config_obj=config, runs=1, rngs=None):
+        self.config = config_obj = freeze(config_obj)
+        if config_obj.surrogate:
+            # Wspólne archiwum modelu zastępczego łączyłoby informacje z niezależnych przebiegów
+            raise ValueError("Surrogate evaluation is not supported with stacked runs")
+        self.runs = runs
+        self.size = config_obj.population_size
+        self.num_variables = config_obj.num_variables
+        self.bounds = (config_obj.range_start, config_obj.range_end)
+        self.rng = StackedGenerator(rngs if rngs is not None else spawn_generators(runs, config_obj.seed))
+
+        self.genomes = self.rng.uniform(self.bounds[0], self.bounds[1], size=(runs, self.size, self.num_variables))
+        self.fitness = np.full((runs, self.size), np.inf)
+        self.dirty = np.ones((runs, self.size), dtype=bool)
+        self.active = np.ones(runs, dtype=bool)
+        self.evaluations = np.zeros(runs, dtype=int)
+        self.generations = np.zeros(runs, dtype=int)
+        self.best_index = np.zeros(runs, dtype=int)
+
+        self.best_fitness_history = [[] for _ in range(runs)]
+        self.avg_fitness_history = [[] for _ in range(runs)]
+        self.stop_reasons = ["epochs"] * runs
+        self.stopping = [StopCriteria(config_obj) for _ in range(runs)]
+        # Każdy przebieg ma własną pamięć podręczną, więc jego wynik nie zależy od pozostałych
+        self.caches = None
+        if config_obj.fitness_cache_size:
+            self.caches = [FitnessCache(config_obj.fitness_cache_size, config_obj.precision) for _ in range(runs)]
+        self.evaluator = make_evaluator(config_obj.replace(fitness_cache_size=0))
+        self.profiler = make_profiler(config_obj)
+
+    def sort_keys(self):
+        return -self.fitness if self.config.optimization_type == "max" else self.fitness
+
+    def evaluate_all(self, fitness_func=evaluate_fitness):
+        with self.profiler.phase("evaluation"):
+            dirty = self.dirty & self.active[:, None]
+            if dirty.any():
+                if self.caches is None:
+                    self.fitness[dirty] = self.evaluator.evaluate(fitness_func, self.genomes[dirty])
+                    self.evaluations += dirty.sum(axis=1)
+                else:
+                    self.evaluate_cached(fitness_func, dirty)
+                self.dirty[dirty] = False
+
+        with self.profiler.phase("history"):
+            self.update_best()
+            best = self.best_fitness()
+            avg = self.fitness.mean(axis=1)
+            for run in np.flatnonzero(self.active):
+                self.best_fitness_history[run].append(float(best[run]))
+                self.avg_fitness_history[run].append(float(avg[run]))
+
+    def evaluate_cached(self, fitness_func, dirty):
+        """
+        Genomy spoza pamięci podręcznych wszystkich przebiegów są oceniane jednym wywołaniem;
+        evaluations liczy tylko faktycznie policzone genomy każdego przebiegu.
+        """
+        splits = []
+        for run in np.flatnonzero(dirty.any(axis=1)):
+            rows = np.flatnonzero(dirty[run])
+            values, pending = self.caches[run].split(self.genomes[run, rows])
+            splits.append((run, rows, values, pending))
+            self.evaluations[run] += len(pending)
+
+        first = [self.genomes[run, rows[indices[0]]] for run, rows, _, pending in splits
+                 for indices in pending.values()]
+        computed = self.evaluator.evaluate(fitness_func, np.array(first)) if first else np.empty(0)
+
+        start = 0
+        for run, rows, values, pending in splits:
+            self.caches[run].fill(values, pending, computed[start:start + len(pending)])
+            self.fitness[run, rows] = values
+            start += len(pending)
+
+    def update_best(self):
+        self.best_index = np.argmin(self.sort_keys(), axis=1)
+
+    def best_fitness(self):
+        return self.fitness[np.arange(self.runs), self.best_index]
+
+    def check_stopping(self, label):
+        with self.profiler.phase("stopping"):
+            best = self.best_fitness()
+            for run in np.flatnonzero(self.active):
+                reason = self.stopping[run].check(float(best[run]), int(self.evaluations[run]))
+                if reason is not None:
+                    self.active[run] = False
+                    self.stop_reasons[run] = reason
+                    print(f"Przebieg {run}: zatrzymano ({label} {self.generations[run]}): {reason}")
+        return self.active.any()
+
+    def freeze_inactive(self, genomes, fitness, dirty):
+        """
+        Przyjmuje nowy stan tylko dla aktywnych przebiegów - zatrzymane pozostają bez zmian.
+        """
+        if not self.active.all():
+            stopped = ~self.active
+            genomes[stopped] = self.genomes[stopped]
+            fitness[stopped] = self.fitness[stopped]
+            dirty[stopped] = self.dirty[stopped]
+        self.genomes, self.fitness, self.dirty = genomes, fitness, dirty
+        self.generations[self.active] += 1
+
+    def results(self):
+        """
+        Wynik każdego przebiegu: najlepszy osobnik, historie i statystyki.
+        """
+        results = []
+        for run in range(self.runs):
+            index = self.best_index[run]
+            results.append({
+                "best_individual": make_individual(self.genomes[run, index], self.fitness[run, index],
+                                                   self.config.precision),
+                "best_fitness_history": self.best_fitness_history[run],
+                "avg_fitness_history": self.avg_fitness_history[run],
+                "stop_reason": self.stop_reasons[run],
+                "generations": int(self.generations[run]),
+                "evaluations": int(self.evaluations[run]),
+                "run_stats": self.run_stats(run),
+            })
+        return results
+
+    def run_stats(self, run):
+        """
+        Statystyki przebiegu: jego pamięć podręczna oraz profil wspólnego silnika - czasy faz
+        podzielone przez liczbę przebiegów, liczby wywołań bez zmian (jedno na pokolenie stosu).
+        """
+        stats = self.caches[run].stats() if self.caches is not None else {}
+        for key, value in self.profiler.stats(self.evaluator.evaluations).items():
+            stats[key] = value / self.runs if key.endswith("_ms") else value
+        return stats
+
+
+class MultiRunPopulation(StackedRuns):
+    """
+    R niezależnych przebiegów GA w jednym tensorze (R x N x D), odpowiednik ArrayPopulation.
+    """
+
+    def select_parents(self):
+        method = self.config.selection_method
+        optimization_type = self.config.optimization_type
+
+        if method == "tournament":
+            return tournament_indices_stacked(self.fitness, self.size, self.config.tournament_size,
+                                              optimization_type, self.rng)
+        if method == "best":
+            return best_indices_stacked(self.fitness, self.config.best_selection_amount, optimization_type)
+        if method == "roulette":
+            return roulette_indices_stacked(self.fitness, self.size, optimization_type, self.rng)
+        if method == "sus":
+            return sus_indices_stacked(self.fitness, self.size, optimization_type, self.rng)
+        raise ValueError(f"Unknown selection method: {method}")
+
+    def evolve(self):
+        profiler = self.profiler
+
+        with profiler.phase("selection"):
+            selected = self.select_parents()
+        with profiler.phase("elitism"):
+            elites = best_indices_stacked(self.fitness, self.config.best_selection_amount,
+                                          self.config.optimization_type)
+
+        num_children = self.size - elites.shape[1]
+        num_pairs = (num_children + 1) // 2
+
+        with profiler.phase("crossover"):
+            parents1 = take_rows(selected, self.rng.integers(0, selected.shape[1], size=(self.runs, num_pairs)))
+            parents2 = take_rows(selected, self.rng.integers(0, selected.shape[1], size=(self.runs, num_pairs)))
+            mask = (self.rng.random((self.runs, num_pairs)) < self.config.crossover_probability)[..., None]
+
+            genomes1 = take_rows(self.genomes, parents1)
+            genomes2 = take_rows(self.genomes, parents2)
+            operator = BATCH_CROSSOVER_METHODS.get(self.config.crossover_method, arithmetic_crossover_batch)
+            crossed1, crossed2 = operator(genomes1, genomes2, self.rng)
+
+            children = np.empty((self.runs, 2 * num_pairs, self.num_variables))
+            children[:, 0::2] = np.where(mask, crossed1, genomes1)
+            children[:, 1::2] = np.where(mask, crossed2, genomes2)
+        with profiler.phase("mutation"):
+            children = mutate_stacked(children[:, :num_children], self.config.mutation_probability,
+                                      self.config.mutation_method, self.bounds, self.config.mutation_sigma,
+                                      self.rng)
+
+        with profiler.phase("replacement"):
+            parents = np.empty((self.runs, 2 * num_pairs), dtype=int)
+            parents[:, 0::2] = parents1
+            parents[:, 1::2] = parents2
+            parents = parents[:, :num_children]
+            changed = np.any(children != take_rows(self.genomes, parents), axis=2) | take_rows(self.dirty, parents)
+
+            self.freeze_inactive(np.concatenate([children, take_rows(self.genomes, elites)], axis=1),
+                                 np.concatenate([take_rows(self.fitness, parents), take_rows(self.fitness, elites)],
+                                                axis=1),
+                                 np.concatenate([changed, take_rows(self.dirty, elites)], axis=1))
+
+    def run(self, fitness_func=evaluate_fitness):
+        for gen in range(self.config.epochs):
+            self.evaluate_all(fitness_func)
+            if not self.check_stopping("epoka"):
+                break
+
+            self.evolve()
+
+            if gen % 10 == 0:
+                print(f"Epoka {gen}, najlepsze przystosowanie przebiegów: {self.best_fitness()}")
+        else:
+            self.evaluate_all(fitness_func)
+
+        self.evaluator.close()
+        return self.results()
+
+
+class MultiRunGJO(StackedRuns):
+    """
+    R niezależnych przebiegów GJO w jednym tensorze (R x N x D), odpowiednik ArrayGJOAlgorithm.
+    """
+
+    def __init__(self, config_obj=config, runs=1, rngs=None):
+        super().__init__(config_obj, runs, rngs)
+        self.max_iterations = config_obj.epochs
+        self.second_best_index = np.zeros(runs, dtype=int)
+
+    def update_best(self):
+        keys = self.sort_keys()
+        if self.size > 2:
+            top = np.argpartition(keys, 1, axis=1)[:, :2]
+        else:
+            top = np.tile(np.arange(self.size), (self.runs, 1))
+        top = take_rows(top, np.argsort(take_rows(keys, top), axis=1, kind="stable"))
+        self.best_index = top[:, 0]
+        self.second_best_index = top[:, -1]
+
+    def levy_steps(self, shape, beta=1.5):
+        u = self.rng.normal(0.0, levy_sigma(beta), size=shape)
+        v = self.rng.normal(0.0, 1.0, size=shape)
+        return u / np.abs(v) ** (1 / beta)
+
+    def update_positions(self, iteration):
+
+        a = 2 - 2 * iteration / self.max_iterations
+
+        positions = self.genomes
+        shape = positions.shape
+        runs = np.arange(self.runs)
+        best = positions[runs, self.best_index][:, None, :]
+        second_best = positions[runs, self.second_best_index][:, None, :]
+
+        # Bez warunków typu mask.any() - zużycie liczb losowych przebiegu nie może zależeć od innych przebiegów
+        explore = self.rng.random(shape) < 0.5
+        levy = self.rng.random(shape) < 0.5
+
+        step = self.levy_steps(shape)
+        levy_candidate = best + step * np.abs(best - positions)
+
+        r1, r2, r3, r4 = np.moveaxis(self.rng.random((self.runs, 4) + shape[1:]), 1, 0)
+        A1 = 2 * a * r1 - a
+        D_prey1 = np.abs(2 * r2 * best - positions)
+        A2 = 2 * a * r3 - a
+        D_prey2 = np.abs(2 * r4 * second_best - positions)
+        hunt_candidate = ((best - A1 * D_prey1) + (second_best - A2 * D_prey2)) / 2
+
+        if abs(a) < 1:
+            RL = 0.05 * self.rng.normal(0.0, 1.0, size=shape)
+            exploit_candidate = (best + second_best) / 2 + RL
+        else:
+            rows = self.rng.integers(0, self.size, size=shape)
+            rand_positions = positions[runs[:, None, None], rows, np.arange(shape[2])]
+            exploit_candidate = rand_positions + self.rng.uniform(-1, 1, size=shape) * np.abs(rand_positions - positions)
+
+        new_positions = np.where(explore, np.where(levy, levy_candidate, hunt_candidate), exploit_candidate)
+
+        np.clip(new_positions, self.bounds[0], self.bounds[1], out=new_positions)
+
+        for leaders in (self.best_index, self.second_best_index):
+            new_positions[runs, leaders] = positions[runs, leaders]
+        dirty = self.dirty | np.any(new_positions != positions, axis=2)
+        self.freeze_inactive(new_positions, self.fitness.copy(), dirty)
+
+    def run(self, fitness_func=evaluate_fitness):
+        self.evaluate_all(fitness_func)
+
+        for iteration in range(1, self.max_iterations + 1):
+            if not self.check_stopping("iteracja"):
+                break
+
+            with self.profiler.phase("position_update"):
+                self.update_positions(iteration)
+
+            self.evaluate_all(fitness_func)
+
+            if iteration % 10 == 0:
+                print(f"Iteracja {iteration}, najlepsze przystosowanie przebiegów: {self.best_fitness()}")
+
+        self.evaluator.close()
+        return self.results()
+
+
+def run_multi(algorithm, config_obj=config, runs=1, rngs=None):
+    """
+    Wykonuje `runs` niezależnych przebiegów GA lub GJO naraz. Zwraca listę wyników
+    przebiegów i łączny czas wykonania.
+    """
+    start_time = time.time()
+    engine_class = MultiRunPopulation if algorithm == "GA" else MultiRunGJO
+    engine = engine_class(config_obj, runs, rngs)
+    results = engine.run(evaluate_fitness)
+    execution_time = time.time() - start_time
+    print(f"Czas wykonania {runs} przebiegów {algorithm}: {execution_time:.2f} sekund")
+    return results, execution_time
@@ -1,6 +1,7 @@
 import random
+import numpy as np
 
-def mutate_uniform(chromosome, position, a=-20, b=20):
+def mutate_uniform(chromosome, position, a=-20, b=20, rng=random):
     """
     Mutacja równomierna - zastępuje gen losową wartością z przedziału [a, b]
 
@@ -9,17 +10,18 @@ def mutate_uniform(chromosome, position, a=-20, b=20):
         position: Pozycja genu do zmutowania
         a: Dolna granica przedziału
         b: Górna granica przedziału
+        rng: Generator liczb losowych (obiekt z interfejsem modułu random)
     """
     if 0 <= position < len(chromosome):
         # Losowa wartość z dopuszczalnego przedziału
-        chromosome[position] = random.uniform(a, b)
+        chromosome[position] = rng.uniform(a, b)
     else:
         print(f"Ostrzeżenie: Pozycja {position} poza zakresem chromosomu")
 
     return chromosome
 
 
-def mutate_gaussian(chromosome, position, sigma=1.0, a=-20, b=20):
+def mutate_gaussian(chromosome, position, sigma=1.0, a=-20, b=20, rng=random):
     """
     Mutacja Gaussa - dodaje do genu losową wartość z rozkładu normalnego
 
@@ -29,10 +31,11 @@ def mutate_gaussian(chromosome, position, sigma=1.0, a=-20, b=20):
         sigma: Odchylenie standardowe dla rozkładu normalnego
         a: Dolna granica przedziału
         b: Górna granica przedziału
+        rng: Generator liczb losowych (obiekt z interfejsem modułu random)
     """
     if 0 <= position < len(chromosome):
         # Dodaj losową wartość z rozkładu normalnego
-        mutation = random.gauss(0, sigma)
+        mutation = rng.gauss(0, sigma)
         chromosome[position] += mutation
 
         # Upewnij się, że wartość pozostaje w granicach
@@ -40,4 +43,40 @@ def mutate_gaussian(chromosome, position, sigma=1.0, a=-20, b=20):
     else:
         print(f"Ostrzeżenie: Pozycja {position} poza zakresem chromosomu")
 
-    return chromosome
\ No newline at end of file
+    return chromosome
+
+
+def mutate_population(genomes, mutation_rate, method="uniform", bounds=(-20, 20), sigma=1.0, rng=None):
+    """
+    Mutacja całej populacji naraz - jedna maska Bernoulliego dla wszystkich genów
+
+    Args:
+        genomes: Macierz genomów (N x D), modyfikowana w miejscu
+        mutation_rate: Prawdopodobieństwo mutacji pojedynczego genu
+        method: "uniform" lub "gaussian"
+        bounds: Krotka (a, b) z granicami przedziału
+        sigma: Odchylenie standardowe - liczba lub wektor (D) dla każdego genu osobno
+        rng: Generator liczb losowych numpy
+
+    Returns:
+        Zmutowana macierz genomów
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    a, b = bounds
+    mask = rng.random(genomes.shape) < mutation_rate
+    rows, cols = np.nonzero(mask)
+    if rows.size == 0:
+        return genomes
+
+    if method == "uniform":
+        genomes[rows, cols] = rng.uniform(a, b, size=rows.size)
+    elif method == "gaussian":
+        sigma = np.broadcast_to(np.asarray(sigma, dtype=float), (genomes.shape[1],))
+        mutated = genomes[rows, cols] + rng.normal(0.0, 1.0, size=rows.size) * sigma[cols]
+        genomes[rows, cols] = np.clip(mutated, a, b)
+    else:
+        print(f"Ostrzeżenie: Nieznana metoda mutacji: {method}")
+
+    return genomes
@@ -1,78 +1,97 @@
-import random
+import numpy as np
 from algorithms.individual import Individual
-from algorithms.selection import best_selection, roulette_selection, tournament_selection
-from algorithms.crossover import arithmetic_crossover, linear_crossover, blend_alpha_crossover, \
-    blend_alpha_beta_crossover, averaging_crossover
-from algorithms.config import config
+from algorithms.selection import best_selection, roulette_selection, tournament_selection, sus_selection
+from algorithms.crossover import arithmetic_crossover, CROSSOVER_METHODS
+from algorithms.config import config, freeze
 from algorithms.fitness import evaluate_fitness
+from algorithms.evaluator import make_evaluator
+from algorithms.surrogate import true_mean
+from algorithms.stopping import StopCriteria
+from algorithms.profiler import make_profiler
+from algorithms.rng import make_rng, make_random
 
 
 class Population:
-    def __init__(self, config=config):
-        self.config = config
+    def __init__(self, config=config, rng=None, random=None):
+        self.config = config = freeze(config)
         self.size = config.population_size
         self.num_variables = config.num_variables
         self.precision = config.precision
+        self.bounds = (config.range_start, config.range_end)
+        # Generator NumPy (selekcja) i random.Random (operatory obiektowe) z config.seed
+        self.rng = rng if rng is not None else make_rng(config.seed)
+        self.random = random if random is not None else make_random(config.seed)
         self.generation = 0
         self.individuals = [
-            Individual(num_variables=self.num_variables, precision=self.precision)
+            Individual(num_variables=self.num_variables, precision=self.precision, rng=self.random,
+                       bounds=self.bounds)
             for _ in range(self.size)
         ]
         self.best_individual = None
         self.best_fitness_history = []
         self.avg_fitness_history = []
+        self.evaluator = make_evaluator(config)
+        self.stopping = StopCriteria(config)
+        self.stop_reason = None
+        self.profiler = make_profiler(config)
 
     def evaluate_all(self, fitness_func=evaluate_fitness, bounds=None):
-        if bounds is None:
-            bounds = (self.config.range_start, self.config.range_end)
-
-        for individual in self.individuals:
-            individual.evaluate(fitness_func, bounds)
-
-        if self.config.optimization_type == "max":
-            self.best_individual = max(self.individuals, key=lambda ind: ind.fitness)
-        else:
-            self.best_individual = min(self.individuals, key=lambda ind: ind.fitness)
+        with self.profiler.phase("evaluation"):
+            dirty = [individual for individual in self.individuals if individual.dirty]
+            if dirty:
+                genomes = np.array([individual.chromosomes[0].chromosome for individual in dirty], dtype=float)
+                values = self.evaluator.evaluate(fitness_func, genomes)
+                for individual, value, predicted in zip(dirty, values, self.evaluator.last_predicted):
+                    individual.chromosome_values = list(individual.chromosomes[0].chromosome)
+                    individual.fitness = float(value)
+                    individual.predicted = bool(predicted)
+                    individual.dirty = False
+
+        with self.profiler.phase("history"):
+            if self.config.optimization_type == "max":
+                self.best_individual = max(self.individuals, key=lambda ind: ind.fitness)
+            else:
+                self.best_individual = min(self.individuals, key=lambda ind: ind.fitness)
 
-        avg_fitness = sum(ind.fitness for ind in self.individuals) / self.size
-        self.best_fitness_history.append(self.best_individual.fitness)
-        self.avg_fitness_history.append(avg_fitness)
+            avg_fitness = true_mean(np.array([ind.fitness for ind in self.individuals]),
+                                    np.array([ind.predicted for ind in self.individuals]))
+            self.best_fitness_history.append(self.best_individual.fitness)
+            self.avg_fitness_history.append(avg_fitness)
 
     def select_parents(self):
         method = self.config.selection_method
 
+        optimization_type = self.config.optimization_type
+
         if method == "tournament":
-            selected = tournament_selection(self.individuals, tournament_size=self.config.tournament_size)
+            selected = tournament_selection(self.individuals, tournament_size=self.config.tournament_size,
+                                            optimization_type=optimization_type, rng=self.rng)
         elif method == "best":
-            selected = best_selection(self.individuals, self.config.best_selection_amount)
+            selected = best_selection(self.individuals, self.config.best_selection_amount, optimization_type)
         elif method == "roulette":
-            selected = roulette_selection(self.individuals, self.size)
+            selected = roulette_selection(self.individuals, self.size, optimization_type, self.rng)
+        elif method == "sus":
+            selected = sus_selection(self.individuals, self.size, optimization_type, self.rng)
         else:
             raise ValueError(f"Unknown selection method: {method}")
 
         return selected
 
+    def new_child(self):
+        return Individual(num_variables=self.num_variables, precision=self.precision, random_init=False,
+                          bounds=self.bounds)
+
     def crossover(self, parent1, parent2):
         method = self.config.crossover_method
 
-        child1 = Individual(num_variables=self.num_variables, precision=self.precision, random_init=False)
-        child2 = Individual(num_variables=self.num_variables, precision=self.precision, random_init=False)
+        child1 = self.new_child()
+        child2 = self.new_child()
 
         parent1_values = parent1.chromosome_values
         parent2_values = parent2.chromosome_values
 
-        if method == "arithmetic":
-            child1_values, child2_values = arithmetic_crossover(parent1_values, parent2_values)
-        elif method == "linear":
-            child1_values, child2_values = linear_crossover(parent1_values, parent2_values)
-        elif method == "blend_alpha":
-            child1_values, child2_values = blend_alpha_crossover(parent1_values, parent2_values)
-        elif method == "blend_alpha_beta":
-            child1_values, child2_values = blend_alpha_beta_crossover(parent1_values, parent2_values)
-        elif method == "averaging":
-            child1_values, child2_values = averaging_crossover(parent1_values, parent2_values)
-        else:
-            child1_values, child2_values = arithmetic_crossover(parent1_values, parent2_values)
+        operator = CROSSOVER_METHODS.get(method, arithmetic_crossover)
+        child1_values, child2_values = operator(parent1_values, parent2_values, self.random)
 
         child1.chromosomes[0].set_chromosome(child1_values)
         child2.chromosomes[0].set_chromosome(child2_values)
@@ -80,46 +99,88 @@ class Population:
         return child1, child2
 
     def evolve(self):
-        selected = self.select_parents()
-        if self.config.optimization_type == "max":
-            elites = sorted(self.individuals, key=lambda ind: ind.fitness, reverse=True)[
-                     :self.config.best_selection_amount]
-        else:
-            elites = sorted(self.individuals, key=lambda ind: ind.fitness)[:self.config.best_selection_amount]
-
-        new_population = []
-
-        while len(new_population) < self.size - len(elites):
-            parent1 = random.choice(selected)
-            parent2 = random.choice(selected)
-
-            if random.random() < self.config.crossover_probability:
-                child1, child2 = self.crossover(parent1, parent2)
+        profiler = self.profiler
+        config = self.config
+
+        with profiler.phase("selection"):
+            selected = self.select_parents()
+        with profiler.phase("elitism"):
+            if config.optimization_type == "max":
+                elites = sorted(self.individuals, key=lambda ind: ind.fitness, reverse=True)[
+                         :config.best_selection_amount]
             else:
-                child1 = Individual(num_variables=self.num_variables, precision=self.precision, random_init=False)
-                child2 = Individual(num_variables=self.num_variables, precision=self.precision, random_init=False)
-                child1.chromosomes[0].set_chromosome(parent1.chromosome_values)
-                child2.chromosomes[0].set_chromosome(parent2.chromosome_values)
-
-            child1.apply_mutation(self.config.mutation_probability, method=self.config.mutation_method)
-            child2.apply_mutation(self.config.mutation_probability, method=self.config.mutation_method)
+                elites = sorted(self.individuals, key=lambda ind: ind.fitness)[:config.best_selection_amount]
 
-            if len(new_population) < self.size - len(elites):
+        new_population = []
+        bounds = self.bounds
+        num_children = self.size - len(elites)
+        crossover_probability = config.crossover_probability
+        mutation_probability = config.mutation_probability
+        mutation_method = config.mutation_method
+        mutation_sigma = config.mutation_sigma
+
+        while len(new_population) < num_children:
+            parent1 = self.random.choice(selected)
+            parent2 = self.random.choice(selected)
+
+            with profiler.phase("crossover"):
+                if self.random.random() < crossover_probability:
+                    child1, child2 = self.crossover(parent1, parent2)
+                else:
+                    child1 = self.new_child()
+                    child2 = self.new_child()
+                    child1.chromosomes[0].set_chromosome(list(parent1.chromosome_values))
+                    child2.chromosomes[0].set_chromosome(list(parent2.chromosome_values))
+
+                # Dziecko równe rodzicowi (kopia lub krzyżowanie bez zmiany genomu) dziedziczy
+                # jego przystosowanie - ocena tylko, jeśli mutacja je zmieni
+                for child, parent in ((child1, parent1), (child2, parent2)):
+                    if child.chromosomes[0].chromosome == parent.chromosome_values:
+                        child.chromosome_values = list(parent.chromosome_values)
+                        child.fitness = parent.fitness
+                        child.dirty = parent.dirty
+                        child.predicted = parent.predicted
+
+            with profiler.phase("mutation"):
+                child1.apply_mutation(mutation_probability, method=mutation_method,
+                                      bounds=bounds, sigma=mutation_sigma, rng=self.random)
+                child2.apply_mutation(mutation_probability, method=mutation_method,
+                                      bounds=bounds, sigma=mutation_sigma, rng=self.random)
+
+            if len(new_population) < num_children:
                 new_population.append(child1)
-            if len(new_population) < self.size - len(elites):
+            if len(new_population) < num_children:
                 new_population.append(child2)
 
         new_population.extend(elites)
         self.individuals = new_population
         self.generation += 1
 
-    def run(self, fitness_func=evaluate_fitness, bounds=None):
+    def run(self, fitness_func=evaluate_fitness, bounds=None, on_generation=None):
+        """
+        on_generation(gen) jest wywoływane po ocenie i sprawdzeniu kryteriów stopu,
+        przed utworzeniem kolejnego pokolenia.
+        """
+        self.stop_reason = "epochs"
         for gen in range(self.config.epochs):
             self.evaluate_all(fitness_func, bounds)
+
+            with self.profiler.phase("stopping"):
+                reason = self.stopping.check(self.best_individual.fitness, self.evaluator.evaluations)
+            if reason is not None:
+                self.stop_reason = reason
+                print(f"Zatrzymano w epoce {gen}: {reason}")
+                break
+
+            if on_generation is not None:
+                on_generation(gen)
+
             self.evolve()
 
             if gen % 10 == 0:
                 print(f"Epoka {gen}, najlepsze przystosowanie: {self.best_individual.fitness}")
+        else:
+            self.evaluate_all(fitness_func, bounds)
 
-        self.evaluate_all(fitness_func, bounds)
+        self.evaluator.close()
         return self.best_individual, self.best_fitness_history, self.avg_fitness_history
@@ -0,0 +1,105 @@
+import contextlib
+from time import perf_counter_ns
+from algorithms.config import config
+
+
+class _Phase:
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, perf_counter_ns() - self.start)
+        return False
+
+
+class PhaseProfiler:
+    """
+    Sumuje czas (perf_counter_ns) i liczbę wywołań poszczególnych faz pętli
+    ewolucyjnej: selekcji, krzyżowania, mutacji, oceny, aktualizacji historii itd.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.times = {}
+        self.calls = {}
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def add(self, name, elapsed_ns):
+        self.times[name] = self.times.get(name, 0) + elapsed_ns
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def stats(self, evaluations=None):
+        """
+        Płaski słownik do Plotter.run_stats: profile_<faza>_ms i profile_<faza>_calls.
+        """
+        stats = {}
+        for name, elapsed in self.times.items():
+            stats[f"profile_{name}_ms"] = elapsed / 1e6
+            stats[f"profile_{name}_calls"] = self.calls[name]
+        stats["profile_total_ms"] = sum(self.times.values()) / 1e6
+        if evaluations and "evaluation" in self.times:
+            stats["profile_us_per_evaluation"] = self.times["evaluation"] / 1e3 / evaluations
+        return stats
+
+
+class NullProfiler:
+    """
+    Profiler wyłączony - phase() zwraca współdzielony pusty kontekst.
+    """
+
+    enabled = False
+
+    _context = contextlib.nullcontext()
+
+    def phase(self, name):
+        return self._context
+
+    def add(self, name, elapsed_ns):
+        pass
+
+    def stats(self, evaluations=None):
+        return {}
+
+
+NULL_PROFILER = NullProfiler()
+
+
+def make_profiler(config_obj=config):
+    return PhaseProfiler() if config_obj.profile else NULL_PROFILER
+
+
+def aggregate_profiles(rows):
+    """
+    Sumuje kolumny profile_* z wierszy wyników, osobno dla każdego algorytmu.
+    Zwraca {algorytm: {faza: {"time_ms", "calls", "share"}}}.
+    """
+    summary = {}
+    for row in rows:
+        phases = summary.setdefault(row.get("algorithm", ""), {})
+        for key, value in row.items():
+            if not key.startswith("profile_") or value is None or value != value:
+                continue
+            if key.endswith("_ms") and key != "profile_total_ms":
+                phase = phases.setdefault(key[len("profile_"):-len("_ms")], {"time_ms": 0.0, "calls": 0})
+                phase["time_ms"] += value
+            elif key.endswith("_calls"):
+                phase = phases.setdefault(key[len("profile_"):-len("_calls")], {"time_ms": 0.0, "calls": 0})
+                phase["calls"] += int(value)
+
+    for phases in summary.values():
+        total = sum(phase["time_ms"] for phase in phases.values())
+        for phase in phases.values():
+            phase["share"] = phase["time_ms"] / total if total else 0.0
+
+    return {algorithm: phases for algorithm, phases in summary.items() if phases}
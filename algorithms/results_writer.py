@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+from algorithms.history_store import HistoryStore, truncate_partial_line
+
+
+def run_fingerprint(algorithm, params, repeat, seed=None):
+    """
+    Stały identyfikator przebiegu zbudowany z algorytmu, parametrów, numeru powtórzenia i ziarna.
+    """
+    payload = json.dumps({"algorithm": algorithm, "params": params, "repeat": repeat, "seed": seed},
+                         sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class ResultsWriter:
+    """
+    Dopisuje wyniki do pliku zaraz po zakończeniu każdego przebiegu (JSON Lines),
+    a historie przystosowania do binarnego HistoryStore. Historie poszczególnych wysp
+    (silnik islands) trafiają do osobnego pliku <name>_islands.jsonl. Przy resume=True
+    przebiegi, które są już na dysku, są pomijane.
+    """
+
+    history_keys = ("best_fitness_history", "avg_fitness_history")
+    island_key = "island_histories"
+
+    def __init__(self, directory="results", name="batch_results", resume=False):
+        self.directory = directory
+        self.results_path = os.path.join(directory, f"{name}.jsonl")
+        self.islands_path = os.path.join(directory, f"{name}_islands.jsonl")
+        os.makedirs(directory, exist_ok=True)
+
+        for path in (self.results_path, self.islands_path):
+            if not resume and os.path.exists(path):
+                os.remove(path)
+            elif resume:
+                truncate_partial_line(path)
+
+        self.histories = HistoryStore(directory, name, resume=resume)
+        self.completed = {row["run_id"] for row in self.read_lines(self.results_path)
+                          if row["run_id"] in self.histories.rows}
+
+    @staticmethod
+    def read_lines(path):
+        if not os.path.exists(path):
+            return []
+
+        rows = []
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Niedokończony ostatni wiersz po przerwanym przebiegu
+                    continue
+        return rows
+
+    @staticmethod
+    def append_line(path, record):
+        with open(path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record, default=float) + "\n")
+            file.flush()
+
+    def is_done(self, run_id):
+        return run_id in self.completed
+
+    def write(self, run_id, row):
+        """
+        Zapisuje wynik przebiegu i zwraca wiersz bez historii (do trzymania w pamięci).
+        """
+        summary = {key: value for key, value in row.items()
+                   if key not in self.history_keys and key != self.island_key}
+        summary["run_id"] = run_id
+
+        # Najpierw historie - wiersz wyniku oznacza, że przebieg jest kompletny
+        self.histories.append(run_id, *(row.get(key, []) for key in self.history_keys))
+        if row.get(self.island_key):
+            self.append_line(self.islands_path, {"run_id": run_id, self.island_key: row[self.island_key]})
+        self.append_line(self.results_path, summary)
+        self.completed.add(run_id)
+        return summary
+
+    def load(self, with_histories=False):
+        """
+        Wiersze wyników w kolejności zapisu; przebieg zapisany więcej niż raz (powtórzony
+        po wznowieniu) występuje tylko raz - w najnowszej wersji.
+        """
+        latest = {}
+        for row in self.read_lines(self.results_path):
+            if row["run_id"] in self.histories.rows:
+                latest.pop(row["run_id"], None)
+                latest[row["run_id"]] = row
+        rows = list(latest.values())
+        if with_histories:
+            islands = {record["run_id"]: record[self.island_key] for record in self.read_lines(self.islands_path)}
+            for row in rows:
+                for key, kind in zip(self.history_keys, HistoryStore.kinds):
+                    row[key] = self.histories.history(row["run_id"], kind).tolist()
+                if row["run_id"] in islands:
+                    row[self.island_key] = islands[row["run_id"]]
+        return rows
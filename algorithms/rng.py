@@ -0,0 +1,46 @@
+import hashlib
+import json
+import random
+import numpy as np
+
+
+def make_rng(seed=None):
+    """
+    Generator NumPy przebiegu. seed=None oznacza losowe ziarno z systemu.
+    """
+    return np.random.default_rng(seed)
+
+
+def make_random(seed=None):
+    """
+    random.Random dla operatorów obiektowych (Individual, Chromosome, GoldenJackal).
+    Ziarno pochodzi z osobnego, potomnego strumienia SeedSequence, więc nie pokrywa
+    się ze strumieniem make_rng(seed) tego samego przebiegu.
+    """
+    if seed is None:
+        return random.Random()
+    child = np.random.SeedSequence(seed).spawn(1)[0]
+    return random.Random(int.from_bytes(child.generate_state(4).tobytes(), "little"))
+
+
+def root_entropy(seed=None):
+    """
+    Ziarno główne eksperymentu; przy seed=None losowane raz, tak aby ziarna
+    przebiegów i tak dało się zapisać i odtworzyć.
+    """
+    return np.random.SeedSequence(seed).entropy
+
+
+def config_key(algorithm, params):
+    payload = json.dumps({"algorithm": algorithm, "params": params}, sort_keys=True, default=str)
+    return int(hashlib.sha1(payload.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def run_seed(root, algorithm, params, repeat):
+    """
+    Ziarno pojedynczego przebiegu: niezależny strumień SeedSequence(root) o kluczu
+    (konfiguracja, powtórzenie). Nie zależy od kolejności konfiguracji ani od tego,
+    który proces roboczy wykona przebieg; config.seed = run_seed(...) odtwarza przebieg.
+    """
+    sequence = np.random.SeedSequence(root, spawn_key=(config_key(algorithm, params), repeat))
+    return int(sequence.generate_state(1, np.uint64)[0])
@@ -1,29 +1,83 @@
-import random
-
-def best_selection(individuals, num_selected):
-    sorted_individuals = sorted(individuals, key=lambda ind: ind.fitness)
-    return [ind for ind in sorted_individuals[:num_selected] if ind is not None]
-
-def roulette_selection(individuals, num_selected):
-    total_fitness = sum(1/ind.fitness for ind in individuals if ind is not None)
-    selection_probs = [(1/ind.fitness)/total_fitness for ind in individuals if ind is not None]
-
-    selected = []
-    for _ in range(num_selected):
-        r = random.random()
-        cumulative_prob = 0
-        for i, ind in enumerate(individuals):
-            if ind is not None:
-                cumulative_prob += selection_probs[i]
-                if r <= cumulative_prob:
-                    selected.append(ind)
-                    break
-    return selected
-
-def tournament_selection(individuals, tournament_size=3):
-    selected = []
-    for _ in range(len(individuals)):
-        tournament = random.sample(individuals, tournament_size)
-        winner = min(tournament, key=lambda ind: ind.fitness)
-        selected.append(winner)
-    return selected
\ No newline at end of file
+import numpy as np
+
+def best_selection(individuals, num_selected, optimization_type="min"):
+    fitness = np.array([ind.fitness for ind in individuals], dtype=float)
+    indices = best_selection_indices(fitness, num_selected, optimization_type)
+    return [individuals[i] for i in indices if individuals[i] is not None]
+
+def roulette_selection(individuals, num_selected, optimization_type="min", rng=None):
+    fitness = np.array([ind.fitness for ind in individuals], dtype=float)
+    indices = roulette_selection_indices(fitness, num_selected, optimization_type, rng)
+    return [individuals[i] for i in indices]
+
+def tournament_selection(individuals, tournament_size=3, optimization_type="min", rng=None):
+    fitness = np.array([ind.fitness for ind in individuals], dtype=float)
+    indices = tournament_selection_indices(fitness, len(individuals), tournament_size, optimization_type, rng)
+    return [individuals[i] for i in indices]
+
+def sus_selection(individuals, num_selected, optimization_type="min", rng=None):
+    fitness = np.array([ind.fitness for ind in individuals], dtype=float)
+    indices = sus_selection_indices(fitness, num_selected, optimization_type, rng)
+    return [individuals[i] for i in indices]
+
+
+def selection_weights(fitness, optimization_type="min"):
+    """
+    Przekształca wektor przystosowań w dodatnie wagi (większa waga = lepszy osobnik):
+    w = 1 / (1 + odległość od najlepszego). Działa także dla wartości ujemnych i zerowych;
+    wartości nieskończone dostają wagę 0.
+    """
+    fitness = np.asarray(fitness, dtype=float)
+    finite = np.isfinite(fitness)
+    if not finite.any():
+        return np.ones_like(fitness)
+
+    values = fitness[finite]
+    if optimization_type == "max":
+        distance = values.max() - values
+    else:
+        distance = values - values.min()
+
+    weights = np.zeros_like(fitness)
+    weights[finite] = 1.0 / (1.0 + distance)
+    return weights
+
+def best_selection_indices(fitness, num_selected, optimization_type="min"):
+    fitness = np.asarray(fitness, dtype=float)
+    keys = -fitness if optimization_type == "max" else fitness
+    num_selected = min(num_selected, len(keys))
+    if num_selected < len(keys):
+        candidates = np.argpartition(keys, num_selected - 1)[:num_selected]
+    else:
+        candidates = np.arange(len(keys))
+    return candidates[np.argsort(keys[candidates], kind="stable")]
+
+def roulette_selection_indices(fitness, num_selected, optimization_type="min", rng=None):
+    if rng is None:
+        rng = np.random.default_rng()
+
+    cumulative = np.cumsum(selection_weights(fitness, optimization_type))
+    draws = rng.random(num_selected) * cumulative[-1]
+    return np.searchsorted(cumulative, draws, side="right").clip(max=len(cumulative) - 1)
+
+def sus_selection_indices(fitness, num_selected, optimization_type="min", rng=None):
+    if rng is None:
+        rng = np.random.default_rng()
+
+    cumulative = np.cumsum(selection_weights(fitness, optimization_type))
+    step = cumulative[-1] / num_selected
+    pointers = rng.random() * step + step * np.arange(num_selected)
+    return np.searchsorted(cumulative, pointers, side="right").clip(max=len(cumulative) - 1)
+
+def tournament_selection_indices(fitness, num_selected, tournament_size=3, optimization_type="min", rng=None):
+    if rng is None:
+        rng = np.random.default_rng()
+
+    fitness = np.asarray(fitness, dtype=float)
+    contestants = rng.integers(0, len(fitness), size=(num_selected, tournament_size))
+    scores = fitness[contestants]
+    if optimization_type == "max":
+        winners = np.argmax(scores, axis=1)
+    else:
+        winners = np.argmin(scores, axis=1)
+    return contestants[np.arange(num_selected), winners]
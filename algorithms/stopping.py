@@ -0,0 +1,57 @@
+import time
+from algorithms.config import config
+
+
+class StopCriteria:
+    """
+    Wspólne kryteria wczesnego zatrzymania dla GA i GJO: stagnacja (brak poprawy
+    przez stagnation_window iteracji), osiągnięcie target_fitness, limit liczby
+    ocen funkcji celu oraz limit czasu w sekundach. Ustawienie cancel_event
+    (threading.Event) przerywa przebieg między pokoleniami z powodem "cancelled".
+    """
+
+    def __init__(self, config_obj=config):
+        self.optimization_type = config_obj.optimization_type
+        self.window = config_obj.stagnation_window
+        self.tolerance = config_obj.stagnation_tolerance
+        self.target = config_obj.target_fitness
+        self.max_evaluations = config_obj.max_evaluations
+        self.time_limit = config_obj.time_limit
+        self.start_time = time.perf_counter()
+        self.best = None
+        self.stagnant = 0
+        self.cancel_event = None
+
+    def improved(self, fitness):
+        if self.best is None:
+            return True
+        if self.optimization_type == "max":
+            return fitness > self.best + self.tolerance
+        return fitness < self.best - self.tolerance
+
+    def reached_target(self, fitness):
+        if self.optimization_type == "max":
+            return fitness >= self.target
+        return fitness <= self.target
+
+    def check(self, best_fitness, evaluations):
+        """
+        Zwraca powód zatrzymania albo None, jeśli algorytm ma kontynuować.
+        """
+        if self.improved(best_fitness):
+            self.best = best_fitness
+            self.stagnant = 0
+        else:
+            self.stagnant += 1
+
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            return "cancelled"
+        if self.target is not None and self.reached_target(best_fitness):
+            return "target_fitness"
+        if self.window and self.stagnant >= self.window:
+            return "stagnation"
+        if self.max_evaluations is not None and evaluations >= self.max_evaluations:
+            return "max_evaluations"
+        if self.time_limit is not None and time.perf_counter() - self.start_time >= self.time_limit:
+            return "time_limit"
+        return None
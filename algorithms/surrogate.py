@@ -0,0 +1,192 @@
+from collections import deque
+import numpy as np
+
+
+class RBFSurrogate:
+    """
+    Model zastępczy funkcji celu: interpolacja RBF z jądrem sześciennym phi(r) = r^3
+    i liniowym członem wielomianowym. Genomy są skalowane do [0, 1] względem stałych
+    granic przestrzeni poszukiwań, dzięki czemu macierz jądra archiwum można
+    utrzymywać przyrostowo: add() dokłada wiersze i kolumny nowych punktów,
+    remove_oldest() je odcina, a solve() rozwiązuje tylko mały układ (n + d + 1).
+    """
+
+    def __init__(self, bounds, ridge=1e-8):
+        self.low = float(bounds[0])
+        self.scale = max(float(bounds[1]) - float(bounds[0]), 1e-12)
+        self.ridge = ridge
+        self.centers = None
+        self.values = None
+        self.phi = None
+        self.weights = None
+        self.coefficients = None
+
+    @property
+    def size(self):
+        return 0 if self.centers is None else len(self.centers)
+
+    def scaled(self, genomes):
+        return (genomes - self.low) / self.scale
+
+    @staticmethod
+    def distances(a, b):
+        sq = np.einsum("ij,ij->i", a, a)[:, None] + np.einsum("ij,ij->i", b, b)[None, :] - 2.0 * a @ b.T
+        return np.sqrt(np.maximum(sq, 0.0))
+
+    def kernel(self, a, b):
+        return self.distances(a, b) ** 3
+
+    @staticmethod
+    def poly(points):
+        return np.hstack([np.ones((len(points), 1)), points])
+
+    def fit(self, genomes, values):
+        self.centers = self.scaled(genomes)
+        self.values = np.asarray(values, dtype=float)
+        self.phi = self.kernel(self.centers, self.centers)
+        self.solve()
+
+    def add(self, genomes, values):
+        points = self.scaled(genomes)
+        border = self.kernel(self.centers, points)
+        self.phi = np.block([[self.phi, border], [border.T, self.kernel(points, points)]])
+        self.centers = np.vstack([self.centers, points])
+        self.values = np.concatenate([self.values, values])
+
+    def remove_oldest(self, count):
+        if count > 0:
+            self.phi = self.phi[count:, count:]
+            self.centers = self.centers[count:]
+            self.values = self.values[count:]
+
+    def solve(self):
+        n, d = self.centers.shape
+        poly = self.poly(self.centers)
+        system = np.zeros((n + d + 1, n + d + 1))
+        system[:n, :n] = self.phi
+        system[np.diag_indices(n)] += self.ridge
+        system[:n, n:] = poly
+        system[n:, :n] = poly.T
+        rhs = np.concatenate([self.values, np.zeros(d + 1)])
+
+        try:
+            solution = np.linalg.solve(system, rhs)
+        except np.linalg.LinAlgError:
+            # Powtórzone lub współliniowe punkty archiwum - rozwiązanie najmniejszych kwadratów
+            solution = np.linalg.lstsq(system, rhs, rcond=None)[0]
+
+        self.weights = solution[:n]
+        self.coefficients = solution[n:]
+
+    def predict(self, genomes):
+        points = self.scaled(genomes)
+        return self.kernel(points, self.centers) @ self.weights + self.poly(points) @ self.coefficients
+
+
+def true_mean(fitness, predicted):
+    """
+    Średnie przystosowanie liczone tylko po prawdziwych ocenach (predicted - maska
+    wartości pochodzących z modelu zastępczego); bez prawdziwych ocen - po wszystkich.
+    """
+    true = ~predicted
+    if predicted.any() and true.any():
+        return float(np.mean(fitness[true]))
+    return float(np.mean(fitness))
+
+
+class SurrogateScreen:
+    """
+    Wstępna selekcja potomstwa modelem zastępczym, uczonym na archiwum prawdziwych
+    ocen (ostatnie archive_size skończonych wartości). Nowe prawdziwe oceny trafiają
+    do modelu przyrostowo (macierz jądra jest rozszerzana, najstarsze punkty odcinane),
+    a model jest rozwiązywany ponownie tylko wtedy, gdy od ostatniego razu doszły dane.
+
+    Z każdej partii genomów prawdziwą ocenę dostaje najbardziej obiecująca część
+    (fraction) według predykcji oraz każdy genom, którego predykcja jest lepsza od
+    najlepszej prawdziwej wartości w partii - dzięki temu najlepszy osobnik partii
+    ma zawsze prawdziwe przystosowanie. Pozostałe dostają wartość przewidzianą;
+    last_predicted to maska tych genomów w ostatniej partii.
+    Dopóki archiwum ma mniej niż min_archive punktów, wszystko oceniane jest prawdziwie.
+    """
+
+    def __init__(self, bounds, fraction=0.3, archive_size=500, min_archive=None, optimization_type="min"):
+        self.fraction = fraction
+        self.archive_size = archive_size
+        self.min_archive = min_archive
+        self.sign = -1.0 if optimization_type == "max" else 1.0
+        self.archive_genomes = deque(maxlen=archive_size)
+        self.archive_values = deque(maxlen=archive_size)
+        self.model = RBFSurrogate(bounds)
+        self.fitted = False
+        self.pending = []
+        self.last_predicted = None
+        self.surrogate_evaluations = 0
+        self.fits = 0
+
+    def add(self, genomes, values):
+        values = np.asarray(values, dtype=float)
+        finite = np.isfinite(values)
+        if finite.any():
+            genomes = np.array(genomes[finite], dtype=float)
+            self.archive_genomes.extend(genomes)
+            self.archive_values.extend(values[finite])
+            self.pending.append((genomes, values[finite]))
+
+    def ready(self, num_variables):
+        min_archive = self.min_archive if self.min_archive is not None else 2 * (num_variables + 1)
+        return len(self.archive_values) >= min_archive
+
+    def update(self):
+        if not self.fitted:
+            self.model.fit(np.array(self.archive_genomes), np.array(self.archive_values))
+        elif self.pending:
+            genomes = np.concatenate([genomes for genomes, _ in self.pending])[-self.archive_size:]
+            values = np.concatenate([values for _, values in self.pending])[-self.archive_size:]
+            self.model.add(genomes, values)
+            self.model.remove_oldest(self.model.size - len(self.archive_values))
+            self.model.solve()
+        else:
+            return
+
+        self.fitted = True
+        self.pending = []
+        self.fits += 1
+
+    def evaluate(self, genomes, true_evaluate):
+        if not self.ready(genomes.shape[1]):
+            values = true_evaluate(genomes)
+            self.add(genomes, values)
+            self.last_predicted = np.zeros(len(genomes), dtype=bool)
+            return values
+
+        self.update()
+        predicted = self.model.predict(genomes)
+        keys = self.sign * predicted
+        order = np.argsort(keys, kind="stable")
+        num_true = max(1, int(np.ceil(self.fraction * len(genomes))))
+
+        values = predicted.copy()
+        screened = np.zeros(len(genomes), dtype=bool)
+        screened[order[:num_true]] = True
+        values[screened] = true_evaluate(genomes[screened])
+
+        # Predykcje lepsze od najlepszej prawdziwej wartości partii też są sprawdzane
+        best_true = np.min(self.sign * values[screened])
+        promising = ~screened & (keys < best_true)
+        if promising.any():
+            values[promising] = true_evaluate(genomes[promising])
+            screened |= promising
+
+        self.add(genomes[screened], values[screened])
+        self.last_predicted = ~screened
+        self.surrogate_evaluations += int(np.count_nonzero(~screened))
+        return values
+
+    def clear(self):
+        self.archive_genomes.clear()
+        self.archive_values.clear()
+        self.pending = []
+        self.fitted = False
+
+    def stats(self):
+        return {"surrogate_evaluations": self.surrogate_evaluations, "surrogate_fits": self.fits}
@@ -0,0 +1,123 @@
+import argparse
+
+from algorithms.config import config, freeze
+
+
+CONFIG_OPTIONS = {
+    "function": str,
+    "range_start": float,
+    "range_end": float,
+    "epochs": int,
+    "population_size": int,
+    "precision": int,
+    "num_variables": int,
+    "selection_method": str,
+    "best_selection_amount": int,
+    "tournament_size": int,
+    "crossover_method": str,
+    "crossover_probability": float,
+    "mutation_method": str,
+    "mutation_probability": float,
+    "mutation_sigma": float,
+    "optimization_type": str,
+    "engine": str,
+    "evaluator": str,
+    "evaluator_workers": int,
+    "fitness_cache_size": int,
+    "stagnation_window": int,
+    "stagnation_tolerance": float,
+    "target_fitness": float,
+    "max_evaluations": int,
+    "time_limit": float,
+    "profile": bool,
+    "seed": int,
+    "islands": int,
+    "migration_interval": int,
+    "migration_size": int,
+    "migration_topology": str,
+    "island_backend": str,
+    "surrogate": bool,
+    "surrogate_fraction": float,
+    "surrogate_archive_size": int,
+    "surrogate_min_archive": int,
+}
+
+
+def add_config_options(parser):
+    for name, value_type in CONFIG_OPTIONS.items():
+        if value_type is bool:
+            parser.add_argument(f"--{name.replace('_', '-')}", dest=name, action="store_const", const=True,
+                                default=None)
+        else:
+            parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=value_type, default=None)
+
+
+def build_config(args):
+    return freeze(config).replace(**{name: getattr(args, name) for name in CONFIG_OPTIONS
+                                     if getattr(args, name) is not None})
+
+
+def run_single(args):
+    try:
+        run_config = build_config(args)
+    except ValueError as e:
+        raise SystemExit(f"Błędna konfiguracja: {e}")
+
+    if args.command == "ga":
+        from algorithms.genetic import run_genetic_algorithm
+        best_solution, execution_time, plotter = run_genetic_algorithm(run_config)
+    else:
+        from algorithms.gjo import run_gjo_algorithm
+        best_solution, execution_time, plotter = run_gjo_algorithm(run_config)
+
+    print(f"Najlepsze rozwiązanie: {best_solution.chromosome_values}")
+    print(f"Wartość funkcji celu: {best_solution.fitness}")
+    print(f"Czas wykonania: {execution_time:.2f} sekund")
+    for key, value in plotter.run_stats.items():
+        print(f"{key}: {value}")
+
+    if args.plot:
+        plotter.plot_fitness_history(save=True, show=False)
+
+
+def run_batch_grid(args):
+    from algorithms.genetic import run_batch
+
+    run_batch(resume=args.resume, workers=args.workers, repeats=args.repeats, show=False,
+              experiment_path=args.experiment, stack_repeats=args.stack_repeats or None,
+              plots=args.plots or None, preview=args.preview or None)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Optimization Algorithms - GA & GJO (tryb bez interfejsu graficznego)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("ga", "Pojedynczy przebieg algorytmu genetycznego"),
+                            ("gjo", "Pojedynczy przebieg Golden Jackal Optimization")):
+        command = commands.add_parser(name, help=help_text)
+        add_config_options(command)
+        command.add_argument("--plot", action="store_true", help="Zapisz wykres historii do katalogu results")
+        command.set_defaults(handler=run_single)
+
+    batch = commands.add_parser("batch", help="Eksperyment wsadowy z pliku JSON/TOML (domyślnie experiments/default.json)")
+    batch.add_argument("--experiment", default=None, help="Ścieżka do pliku eksperymentu")
+    batch.add_argument("--workers", type=int, default=None, help="Nadpisuje liczbę procesów z pliku eksperymentu")
+    batch.add_argument("--repeats", type=int, default=None, help="Nadpisuje liczbę powtórzeń z pliku eksperymentu")
+    batch.add_argument("--resume", action="store_true")
+    batch.add_argument("--stack-repeats", action="store_true",
+                       help="Wykonuj powtórzenia konfiguracji naraz jako jeden tensor (R x N x D)")
+    batch.add_argument("--plots", action="store_true",
+                       help="Renderuj wykresy wyników w procesach roboczych (pomija wykresy z niezmienionymi danymi)")
+    batch.add_argument("--preview", action="store_true", help="Szybkie wykresy podglądowe w niskiej rozdzielczości")
+    batch.set_defaults(handler=run_batch_grid)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
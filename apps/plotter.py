@@ -1,28 +1,92 @@
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 import os
+from collections import OrderedDict
 from datetime import datetime
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import tkinter as tk
+
+# matplotlib, pandas i tkinter są importowane dopiero przy pierwszym rysowaniu,
+# dzięki czemu rdzeń algorytmów (i procesy robocze) nie płacą za ich import.
+
+LANDSCAPE_CACHE_SIZE = 16
+LANDSCAPE_CHUNK_VALUES = 4_000_000
+
+_landscape_cache = OrderedDict()
+
+
+def landscape_batch_function(fitness_func, num_variables, config_obj=None):
+    from algorithms.config import config
+    from algorithms.fitness import resolve_batch_fitness, batch_from_scalar
+
+    config_obj = config_obj if config_obj is not None else config
+    batch_func = resolve_batch_fitness(fitness_func, config_obj)
+    if batch_func is None:
+        batch_func = batch_from_scalar(fitness_func, num_variables, config_obj.precision)
+    return batch_func
+
+
+def landscape_grid(fitness_func, bounds, resolution, point, dims=(0, 1), config_obj=None):
+    """
+    Wartości funkcji celu na siatce resolution x resolution - jedno wywołanie wsadowe
+    (w porcjach do LANDSCAPE_CHUNK_VALUES liczb) zamiast pętli po punktach.
+
+    Dla problemów o więcej niż dwóch zmiennych siatka jest przekrojem przez `point`:
+    zmieniają się tylko współrzędne `dims`, pozostałe są stałe. Wyniki są zapamiętywane
+    dla (funkcja, granice, rozdzielczość, przekrój), więc kolejne wykresy są natychmiastowe.
+    """
+    from algorithms.config import config
+
+    config_obj = config_obj if config_obj is not None else config
+    point = np.asarray(point, dtype=float)
+    fixed = tuple(np.delete(point, dims).round(config_obj.precision)) if len(point) > 2 else ()
+    key = (fitness_func, config_obj.function, tuple(bounds), resolution, tuple(dims), len(point), fixed)
+
+    if key in _landscape_cache:
+        _landscape_cache.move_to_end(key)
+        return _landscape_cache[key]
+
+    batch_func = landscape_batch_function(fitness_func, len(point), config_obj)
+
+    x = np.linspace(bounds[0], bounds[1], resolution)
+    X, Y = np.meshgrid(x, x)
+    genomes = np.tile(point, (X.size, 1))
+    genomes[:, dims[0]] = X.ravel()
+    genomes[:, dims[1]] = Y.ravel()
+
+    chunk = max(1, LANDSCAPE_CHUNK_VALUES // len(point))
+    Z = np.concatenate([np.asarray(batch_func(genomes[start:start + chunk]), dtype=float)
+                        for start in range(0, len(genomes), chunk)]).reshape(X.shape)
+
+    _landscape_cache[key] = (X, Y, Z)
+    if len(_landscape_cache) > LANDSCAPE_CACHE_SIZE:
+        _landscape_cache.popitem(last=False)
+    return X, Y, Z
+
 
 class Plotter:
     
     def __init__(self):
         self.output_dir = "results"
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
         
         self.best_fitness_history = []
         self.avg_fitness_history = []
+        self.run_stats = {}
+        self.island_histories = []
         
     def update_history(self, best_fitness, avg_fitness=None):
         self.best_fitness_history.append(best_fitness)
         if avg_fitness is not None:
             self.avg_fitness_history.append(avg_fitness)
 
-    def plot_categorized_batch_comparison(self, results, category_param="population_size", metric="best_fitness", save=True, show=True):
+    def update_stats(self, **stats):
+        self.run_stats.update(stats)
+
+    def output_path(self, filename):
+        os.makedirs(self.output_dir, exist_ok=True)
+        return os.path.join(self.output_dir, filename)
+
+    def plot_categorized_batch_comparison(self, results, category_param="population_size", metric="best_fitness", save=True, show=True,
+                                          dpi=300, filename=None):
+        import matplotlib.pyplot as plt
+        import pandas as pd
 
         df = pd.DataFrame(results)
         categories = sorted(df[category_param].unique())
@@ -47,7 +111,8 @@ class Plotter:
                 labels.append(alg)
 
 
-            ax_plot.boxplot(data, labels=labels, patch_artist=True)
+            ax_plot.boxplot(data, patch_artist=True)
+            ax_plot.set_xticks(range(1, len(labels) + 1), labels)
             ax_plot.set_title(f"{metric.replace('_', ' ').title()} dla {category_param} = {category}")
             ax_plot.set_ylabel(metric.replace('_', ' ').title())
             ax_plot.grid(True, axis='y', alpha=0.3)
@@ -66,9 +131,9 @@ class Plotter:
         plt.tight_layout()
 
         if save:
-            filename = f"batch_comparison_categorized_{category_param}_{metric}.png"
-            filepath = os.path.join(self.output_dir, filename)
-            plt.savefig(filepath, dpi=300, bbox_inches='tight')
+            filename = filename or f"batch_comparison_categorized_{category_param}_{metric}.png"
+            filepath = self.output_path(filename)
+            plt.savefig(filepath, dpi=dpi, bbox_inches='tight')
             print(f"Zapisano wykresy i tabele do pliku: {filepath}")
 
         if show:
@@ -78,7 +143,9 @@ class Plotter:
 
         return filepath if save else None
     
-    def plot_fitness_history(self, title="Historia wartości funkcji celu", save=True, show=True):
+    def plot_fitness_history(self, title="Historia wartości funkcji celu", save=True, show=True, dpi=300, filename=None):
+        import matplotlib.pyplot as plt
+
         fig = plt.figure(figsize=(10, 6))
         generations = list(range(len(self.best_fitness_history)))
         
@@ -95,8 +162,8 @@ class Plotter:
         
         if save:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filepath = os.path.join(self.output_dir, f"fitness_history_{timestamp}.png")
-            plt.savefig(filepath, dpi=300, bbox_inches='tight')
+            filepath = self.output_path(filename or f"fitness_history_{timestamp}.png")
+            plt.savefig(filepath, dpi=dpi, bbox_inches='tight')
             print(f"Zapisano wykres do pliku: {filepath}")
         
         if show:
@@ -106,7 +173,8 @@ class Plotter:
             
         return filepath if save else None
     
-    def plot_convergence(self, title="Zbieżność algorytmu genetycznego", save=True, show=True):
+    def plot_convergence(self, title="Zbieżność algorytmu genetycznego", save=True, show=True, dpi=300, filename=None):
+        import matplotlib.pyplot as plt
 
         if len(self.best_fitness_history) < 2:
             print("Za mało danych do wygenerowania wykresu zbieżności")
@@ -125,8 +193,8 @@ class Plotter:
         
         if save:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filepath = os.path.join(self.output_dir, f"convergence_{timestamp}.png")
-            plt.savefig(filepath, dpi=300, bbox_inches='tight')
+            filepath = self.output_path(filename or f"convergence_{timestamp}.png")
+            plt.savefig(filepath, dpi=dpi, bbox_inches='tight')
             print(f"Zapisano wykres do pliku: {filepath}")
         
         if show:
@@ -136,41 +204,31 @@ class Plotter:
             
         return filepath if save else None
     
-    def plot_function_landscape(self, best_point, fitness_func, bounds, title="Powierzchnia funkcji celu", resolution=50, save=True, show=True):
+    def plot_function_landscape(self, best_point, fitness_func, bounds, title="Powierzchnia funkcji celu", resolution=50, save=True, show=True,
+                                dims=(0, 1), config_obj=None):
+        import matplotlib.pyplot as plt
 
-        if len(best_point) != 2:
-            print("Funkcja krajobrazowa może być narysowana tylko dla funkcji dwuwymiarowych")
+        if len(best_point) < 2:
+            print("Funkcja krajobrazowa wymaga co najmniej dwóch zmiennych")
             return None
-        
-        x_min, x_max = bounds
-        
-        x = np.linspace(x_min, x_max, resolution)
-        y = np.linspace(x_min, x_max, resolution)
-        X, Y = np.meshgrid(x, y)
-        Z = np.zeros_like(X)
-        
-        for i in range(resolution):
-            for j in range(resolution):
-                from algorithms.individual import Individual
-                temp_ind = Individual(num_variables=2, precision=5, random_init=False)
-                temp_ind.chromosome_values = [X[i, j], Y[i, j]]
-                Z[i, j] = fitness_func(temp_ind)
+
+        X, Y, Z = landscape_grid(fitness_func, bounds, resolution, best_point, dims, config_obj)
         
         fig = plt.figure(figsize=(10, 8))
         ax = fig.add_subplot(111, projection='3d')
         
-        surf = ax.plot_surface(X, Y, Z, cmap='viridis', alpha=0.8)
+        # Przy dużej rozdzielczości powierzchnia jest rysowana z siatki co najwyżej 100 x 100
+        surf = ax.plot_surface(X, Y, Z, cmap='viridis', alpha=0.8,
+                               rcount=min(resolution, 100), ccount=min(resolution, 100))
         
-        best_x, best_y = best_point
-        from algorithms.individual import Individual
-        temp_ind = Individual(num_variables=2, precision=5, random_init=False)
-        temp_ind.chromosome_values = [best_x, best_y]
-        best_z = fitness_func(temp_ind)
+        best_x, best_y = best_point[dims[0]], best_point[dims[1]]
+        batch_func = landscape_batch_function(fitness_func, len(best_point), config_obj)
+        best_z = float(batch_func(np.asarray(best_point, dtype=float).reshape(1, -1))[0])
         
         ax.scatter(best_x, best_y, best_z, color='red', s=100, marker='*', label='Najlepszy punkt')
         
-        ax.set_xlabel('x1')
-        ax.set_ylabel('x2')
+        ax.set_xlabel(f'x{dims[0] + 1}')
+        ax.set_ylabel(f'x{dims[1] + 1}')
         ax.set_zlabel('Wartość funkcji celu')
         ax.set_title(title)
         fig.colorbar(surf)
@@ -178,7 +236,7 @@ class Plotter:
         
         if save:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filepath = os.path.join(self.output_dir, f"function_landscape_{timestamp}.png")
+            filepath = self.output_path(f"function_landscape_{timestamp}.png")
             plt.savefig(filepath, dpi=300, bbox_inches='tight')
             print(f"Zapisano wykres do pliku: {filepath}")
         
@@ -190,6 +248,9 @@ class Plotter:
         return filepath if save else None
             
     def show_results_window(self, best_individual, execution_time):
+        import tkinter as tk
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
         results_window = tk.Toplevel()
         results_window.title("Wyniki Algorytmu Genetycznego")
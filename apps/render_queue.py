@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+FULL_DPI = 300
+PREVIEW_DPI = 72
+
+
+def _init_worker():
+    # Procesy robocze renderują tylko do plików - nieinteraktywny backend, bez Tk
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def render_fitness_history(plotter, data, dpi, filename, options):
+    plotter.best_fitness_history = list(data["best_fitness_history"])
+    plotter.avg_fitness_history = list(data.get("avg_fitness_history", []))
+    return plotter.plot_fitness_history(save=True, show=False, dpi=dpi, filename=filename, **options)
+
+
+def render_convergence(plotter, data, dpi, filename, options):
+    plotter.best_fitness_history = list(data["best_fitness_history"])
+    return plotter.plot_convergence(save=True, show=False, dpi=dpi, filename=filename, **options)
+
+
+def render_batch_comparison(plotter, data, dpi, filename, options):
+    return plotter.plot_categorized_batch_comparison(data, save=True, show=False, dpi=dpi, filename=filename,
+                                                     **options)
+
+
+RENDERERS = {
+    "fitness_history": render_fitness_history,
+    "convergence": render_convergence,
+    "batch_comparison": render_batch_comparison,
+}
+
+
+def render_job(job):
+    from apps.plotter import Plotter
+
+    kind, data, path, dpi, options = job
+    plotter = Plotter()
+    plotter.output_dir = os.path.dirname(path) or "."
+    return RENDERERS[kind](plotter, data, dpi, os.path.basename(path), options)
+
+
+def data_hash(kind, data, dpi, options):
+    payload = json.dumps({"kind": kind, "data": data, "dpi": dpi, "options": options}, sort_keys=True,
+                         default=lambda value: value.tolist() if hasattr(value, "tolist") else str(value))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class RenderQueue:
+    """
+    Kolejka wykresów renderowanych w procesach roboczych (backend Agg), tak aby
+    rysowanie dziesiątek wykresów nie blokowało wątku wywołującego.
+
+    W trybie preview wykresy mają niską rozdzielczość i przyrostek "_preview".
+    Skrót danych każdego wykresu trafia do pliku .render_manifest.json; wykres, którego
+    dane (i ustawienia) się nie zmieniły, a plik istnieje, nie jest renderowany ponownie.
+    """
+
+    manifest_name = ".render_manifest.json"
+
+    def __init__(self, output_dir="results", workers=None, preview=False):
+        self.output_dir = output_dir
+        self.workers = workers
+        self.preview = preview
+        self.dpi = PREVIEW_DPI if preview else FULL_DPI
+        self.executor = None
+        self.pending = []
+        self.skipped = 0
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.manifest_path = os.path.join(output_dir, self.manifest_name)
+        self.manifest = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as file:
+                self.manifest = json.load(file)
+
+    def submit(self, kind, data, filename, **options):
+        """
+        Zleca wykres `kind` ("fitness_history", "convergence", "batch_comparison").
+        Zwraca Future albo None, jeśli wykres jest aktualny.
+        """
+        if kind not in RENDERERS:
+            raise ValueError(f"Unknown plot kind: {kind}")
+
+        if self.preview:
+            root, extension = os.path.splitext(filename)
+            filename = f"{root}_preview{extension}"
+        path = os.path.join(self.output_dir, filename)
+
+        digest = data_hash(kind, data, self.dpi, options)
+        if self.manifest.get(filename) == digest and os.path.exists(path):
+            self.skipped += 1
+            return None
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        future = self.executor.submit(render_job, (kind, data, path, self.dpi, options))
+        self.pending.append((filename, digest, future))
+        return future
+
+    def wait(self):
+        """
+        Czeka na zlecone wykresy, zapisuje manifest i zwraca ścieżki wyrenderowanych plików.
+        """
+        paths = []
+        try:
+            for filename, digest, future in self.pending:
+                paths.append(future.result())
+                self.manifest[filename] = digest
+        finally:
+            self.pending = []
+            with open(self.manifest_path, "w", encoding="utf-8") as file:
+                json.dump(self.manifest, file, indent=2, sort_keys=True)
+        return paths
+
+    def close(self):
+        paths = self.wait()
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        return paths
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
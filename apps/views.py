@@ -1,9 +1,10 @@
 import tkinter as tk
 from tkinter import ttk
 from tkinter import filedialog
-from algorithms.config import config
+from algorithms.config import config, freeze
 from algorithms.genetic import run_batch
 from algorithms.genetic import run_genetic_algorithm
+from apps.worker import RunWorker
 import os
 
 
@@ -15,6 +16,79 @@ class Singleton:
             cls._instance = super(Singleton, cls).__new__(cls, *args, **kwargs)
         return cls._instance
 
+class ProgressWindow:
+    """
+    Okno postępu przebiegu: wykres najlepszego i średniego przystosowania rysowany
+    przyrostowo z wiadomości RunWorker oraz przycisk anulowania.
+    """
+
+    poll_interval = 100
+
+    def __init__(self, master, worker, title, on_done):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.worker = worker
+        self.on_done = on_done
+        self.generations = []
+        self.best = []
+        self.avg = []
+
+        self.window = tk.Toplevel(master)
+        self.window.title(title)
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.fig = Figure(figsize=(7, 4))
+        self.ax = self.fig.add_subplot(111)
+        self.best_line, = self.ax.plot([], [], "b-", label="Najlepsze przystosowanie")
+        self.avg_line, = self.ax.plot([], [], "r-", label="Średnie przystosowanie")
+        self.ax.set_xlabel("Epoka")
+        self.ax.set_ylabel("Wartość funkcji celu")
+        self.ax.grid(True)
+        self.ax.legend()
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.window)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+
+        self.status_label = tk.Label(self.window, text="Uruchamianie...")
+        self.status_label.pack(fill="x")
+        self.cancel_button = tk.Button(self.window, text="Anuluj", command=self.cancel)
+        self.cancel_button.pack(fill="x", pady=5)
+
+        self.worker.start()
+        self.window.after(self.poll_interval, self.poll)
+
+    def cancel(self):
+        self.worker.cancel()
+        self.cancel_button.config(state="disabled", text="Anulowanie...")
+
+    def poll(self):
+        finished = None
+        for message in self.worker.drain():
+            if message[0] == "progress":
+                _, gen, best_fitness, avg_fitness = message
+                self.generations.append(gen)
+                self.best.append(best_fitness)
+                self.avg.append(avg_fitness)
+            else:
+                finished = message
+
+        if self.generations:
+            self.best_line.set_data(self.generations, self.best)
+            self.avg_line.set_data(self.generations, self.avg)
+            self.ax.relim()
+            self.ax.autoscale_view()
+            self.canvas.draw_idle()
+            self.status_label.config(text=f"Epoka {self.generations[-1]}, najlepsze przystosowanie: {self.best[-1]}")
+
+        if finished is None:
+            self.window.after(self.poll_interval, self.poll)
+            return
+
+        self.window.destroy()
+        self.on_done(*finished)
+
+
 class MainWindow(Singleton):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -23,7 +97,7 @@ class MainWindow(Singleton):
         self.root.geometry("350x500")
 
         self.algorithms = ["Genetic Algorithm", "Golden Jackal Optimization"]
-        self.selection_methods = ["Best", "Roulette", "Tournament"]
+        self.selection_methods = ["Best", "Roulette", "Tournament", "SUS"]
         self.cross_methods = ["arithmetic", "linear", "blend_alpha" , "blend_alpha_beta" , "averaging"]
         self.mutation_methods = ["uniform", "gaussian"]
 
@@ -179,8 +253,17 @@ class MainWindow(Singleton):
         self.batch_test.pack(fill="x", pady=10)
 
 
+        self.status_label = tk.Label(main_column, text="", wraplength=300)
+        self.status_label.pack(fill="x")
+
         self.on_algorithm_change()
 
+    def set_running(self, running, status=""):
+        state = "disabled" if running else "normal"
+        self.start_button.config(state=state)
+        self.batch_test.config(state=state)
+        self.status_label.config(text=status)
+
     def on_algorithm_change(self, event=None):
         algorithm = self.algorithm_var.get()
         
@@ -205,7 +288,38 @@ class MainWindow(Singleton):
             print(f"Błąd podczas zapisu: {str(e)}")
 
     def run_test(self):
-        run_batch()
+        experiment_path = filedialog.askopenfilename(
+            title="Wybierz plik eksperymentu",
+            initialdir="experiments",
+            filetypes=[("Eksperymenty", "*.json *.toml"), ("Wszystkie pliki", "*.*")],
+        )
+        if not experiment_path:
+            return
+
+        # Okno wyników (własne Tk) musi powstać w wątku głównym, więc run_batch nie wyświetla go sam
+        self.worker = RunWorker(run_batch, experiment_path=experiment_path, show=False, with_progress=False)
+        self.set_running(True, "Eksperyment wsadowy w toku...")
+        self.worker.start()
+        self.root.after(ProgressWindow.poll_interval, self.poll_batch, experiment_path)
+
+    def poll_batch(self, experiment_path):
+        messages = self.worker.drain()
+        if not messages:
+            self.root.after(ProgressWindow.poll_interval, self.poll_batch, experiment_path)
+            return
+
+        status, result = messages[-1]
+        if status == "error":
+            self.set_running(False, f"Błąd: {result}")
+            return
+
+        from algorithms.batch_plotter import show_results_window
+        from algorithms.experiment import load_experiment
+        from algorithms.history_store import HistoryStore
+
+        self.set_running(False, f"Eksperyment zakończony: {len(result)} przebiegów")
+        experiment = load_experiment(experiment_path)
+        show_results_window(result, HistoryStore(experiment["output"], experiment["name"], resume=True))
 
     def run_algorithm(self):
         try:
@@ -230,25 +344,39 @@ class MainWindow(Singleton):
                 config.mutation_method = self.mutation_method_var.get().lower()
                 config.mutation_probability = float(self.mutation_propability_entry.get())
                 
-                best_solution, execution_time, plotter = run_genetic_algorithm()
+                target = run_genetic_algorithm
                 algorithm_name = "Genetic Algorithm"
                 
             elif algorithm == "Golden Jackal Optimization":
                 try:
-                    import sys
-                    import os
                     from algorithms.gjo import run_gjo_algorithm
                     
-                    best_solution, execution_time, plotter = run_gjo_algorithm()
+                    target = run_gjo_algorithm
                     algorithm_name = "Golden Jackal Optimization"
                 except ImportError:
                     print("Błąd: Nie można zaimportować algorytmu GJO. Sprawdź czy plik algorithms/gjo.py istnieje.")
                     return
-            
-            results = f"Algorytm: {algorithm_name}\nNajlepsze rozwiązanie: {best_solution.chromosome_values}\nWartość funkcji celu: {best_solution.fitness}\nCzas wykonania: {execution_time:.2f} sekund\n"
-            self.save_results_to_file(results)
+
+            # Przebieg w wątku w tle dostaje własny, niezmienny RunConfig (walidacja jeszcze w wątku Tk)
+            self.worker = RunWorker(target, freeze(config))
+            self.set_running(True, f"{algorithm_name} w toku...")
+            ProgressWindow(self.root, self.worker, algorithm_name,
+                           lambda status, result: self.on_run_done(algorithm_name, status, result))
             
         except Exception as e:
             print(f"Błąd: {str(e)}")
+            self.status_label.config(text=f"Błąd: {e}")
             import traceback
-            traceback.print_exc()
\ No newline at end of file
+            traceback.print_exc()
+
+    def on_run_done(self, algorithm_name, status, result):
+        if status == "error":
+            self.set_running(False, f"Błąd: {result}")
+            return
+
+        best_solution, execution_time, plotter = result
+        stop_reason = plotter.run_stats.get("stop_reason")
+        self.set_running(False, f"Zakończono ({stop_reason}), najlepsze przystosowanie: {best_solution.fitness}")
+
+        results = f"Algorytm: {algorithm_name}\nNajlepsze rozwiązanie: {best_solution.chromosome_values}\nWartość funkcji celu: {best_solution.fitness}\nCzas wykonania: {execution_time:.2f} sekund\n"
+        self.save_results_to_file(results)
\ No newline at end of file
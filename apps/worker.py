@@ -0,0 +1,50 @@
+import queue
+import threading
+import traceback
+
+
+class RunWorker(threading.Thread):
+    """
+    Wykonuje przebieg algorytmu w wątku w tle. Postęp trafia do bezpiecznej wątkowo
+    kolejki jako ("progress", pokolenie, najlepsze, średnie), a zakończenie jako
+    ("done", wynik) albo ("error", komunikat). Wątek Tk odczytuje kolejkę przez after().
+
+    target(progress=..., cancel_event=...) to np. run_genetic_algorithm lub run_gjo_algorithm;
+    zadania bez postępu (run_batch) podaje się z with_progress=False.
+    """
+
+    def __init__(self, target, *args, with_progress=True, **kwargs):
+        super().__init__(daemon=True)
+        self.target = target
+        self.args = args
+        self.kwargs = kwargs
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+        if with_progress:
+            self.kwargs.update(progress=self.progress, cancel_event=self.cancel_event)
+
+    def progress(self, gen, best_fitness, avg_fitness):
+        self.messages.put(("progress", gen, best_fitness, avg_fitness))
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            result = self.target(*self.args, **self.kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            self.messages.put(("error", str(e)))
+        else:
+            self.messages.put(("done", result))
+
+    def drain(self):
+        """
+        Zwraca wszystkie wiadomości oczekujące w kolejce, bez blokowania.
+        """
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
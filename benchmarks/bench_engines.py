@@ -0,0 +1,206 @@
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from algorithms.config import config, freeze
+from algorithms.fitness import evaluate_fitness
+
+
+ENGINES = ("ga-object", "ga-array", "gjo-object", "gjo-array")
+
+DEFAULT_SWEEP = {
+    "population_size": [50, 500, 5000, 100000],
+    "num_variables": [2, 10, 100, 1000],
+    "selection_method": ["tournament"],
+    "crossover_method": ["arithmetic"],
+    "mutation_method": ["uniform"],
+}
+
+QUICK_SWEEP = {
+    "population_size": [50, 500],
+    "num_variables": [2, 100],
+    "selection_method": ["tournament"],
+    "crossover_method": ["arithmetic"],
+    "mutation_method": ["uniform"],
+}
+
+
+def make_engine(engine, run_config):
+    if engine == "ga-object":
+        from algorithms.population import Population
+        return Population(run_config)
+    if engine == "ga-array":
+        from algorithms.array_population import ArrayPopulation
+        return ArrayPopulation(run_config)
+    if engine == "gjo-object":
+        from algorithms.gjo import GJOAlgorithm
+        gjo = GJOAlgorithm(run_config)
+    else:
+        from algorithms.gjo import ArrayGJOAlgorithm
+        gjo = ArrayGJOAlgorithm(run_config)
+    gjo.initialize_population()
+    return gjo
+
+
+def step(engine, instance, generation):
+    """
+    Jedna generacja/iteracja: operatory genetyczne albo aktualizacja pozycji GJO, a potem ocena.
+    """
+    if engine.startswith("ga"):
+        instance.evolve()
+        instance.evaluate_all(evaluate_fitness)
+    else:
+        instance.update_positions(generation)
+        instance.evaluate_population(evaluate_fitness)
+
+
+def initial_evaluation(engine, instance):
+    if engine.startswith("ga"):
+        instance.evaluate_all(evaluate_fitness)
+    else:
+        instance.evaluate_population(evaluate_fitness)
+
+
+def measure(engine, run_config, min_time=0.5, max_generations=200):
+    instance = make_engine(engine, run_config)
+    initial_evaluation(engine, instance)
+
+    evaluations_before = instance.evaluator.evaluations
+    generations = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while generations < max_generations and (elapsed < min_time or generations < 2):
+        generations += 1
+        step(engine, instance, generations)
+        elapsed = time.perf_counter() - start
+    evaluations = instance.evaluator.evaluations - evaluations_before
+
+    # Pamięć mierzona osobno - tracemalloc spowalnia kod Pythona i zafałszowałby przepustowość
+    tracemalloc.start()
+    instance = make_engine(engine, run_config)
+    initial_evaluation(engine, instance)
+    step(engine, instance, 1)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "generations": generations,
+        "seconds": elapsed,
+        "generations_per_sec": generations / elapsed,
+        "evaluations_per_sec": evaluations / elapsed,
+        "peak_memory_mb": peak / 2 ** 20,
+    }
+
+
+def case_key(case):
+    return "|".join(f"{name}={case[name]}" for name in ("engine", *DEFAULT_SWEEP))
+
+
+def run_suite(sweep, engines=ENGINES, function="hypersphere", min_time=0.5, max_generations=200,
+              max_object_cells=200000, max_array_cells=10000000):
+    results = []
+    names = list(sweep)
+    for engine in engines:
+        for values in itertools.product(*sweep.values()):
+            case = {"engine": engine, **dict(zip(names, values))}
+            cells = case["population_size"] * case["num_variables"]
+            if cells > (max_object_cells if engine.endswith("object") else max_array_cells):
+                continue
+
+            run_config = freeze(config).replace(function=function, epochs=max_generations, best_selection_amount=2,
+                                                **{name: case[name] for name in names})
+
+            metrics = measure(engine, run_config, min_time, max_generations)
+            result = {**case, "key": case_key(case), **metrics}
+            results.append(result)
+            print(f"{result['key']}: {metrics['generations_per_sec']:.2f} gen/s, "
+                  f"{metrics['evaluations_per_sec']:.0f} ocen/s, {metrics['peak_memory_mb']:.1f} MB", flush=True)
+    return results
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+    Zwraca listę regresji: przypadki, w których gen/s spadło o więcej niż threshold względem bazy.
+    """
+    reference = {result["key"]: result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        base = reference.get(result["key"])
+        if base is None:
+            continue
+        ratio = result["generations_per_sec"] / base["generations_per_sec"]
+        if ratio < 1 - threshold:
+            regressions.append({"key": result["key"], "ratio": ratio,
+                                "baseline": base["generations_per_sec"],
+                                "current": result["generations_per_sec"]})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark przepustowości silników GA i GJO")
+    parser.add_argument("--quick", action="store_true", help="Mała siatka do szybkiego sprawdzenia")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--population-sizes", nargs="+", type=int)
+    parser.add_argument("--num-variables", nargs="+", type=int)
+    parser.add_argument("--selection-methods", nargs="+")
+    parser.add_argument("--crossover-methods", nargs="+")
+    parser.add_argument("--mutation-methods", nargs="+")
+    parser.add_argument("--function", default="hypersphere")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Minimalny czas pomiaru na przypadek [s]")
+    parser.add_argument("--max-generations", type=int, default=200)
+    parser.add_argument("--max-object-cells", type=int, default=200000,
+                        help="Pomija silniki obiektowe, gdy N x D przekracza tę wartość")
+    parser.add_argument("--max-array-cells", type=int, default=10000000,
+                        help="Pomija silniki tablicowe, gdy N x D przekracza tę wartość "
+                             "(10^7 komórek to ok. 80 MB na jedną macierz genomów)")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="Plik JSON z wcześniejszego przebiegu do porównania")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Dopuszczalny spadek gen/s (0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    sweep = dict(QUICK_SWEEP if args.quick else DEFAULT_SWEEP)
+    for name, option in (("population_size", args.population_sizes), ("num_variables", args.num_variables),
+                         ("selection_method", args.selection_methods),
+                         ("crossover_method", args.crossover_methods),
+                         ("mutation_method", args.mutation_methods)):
+        if option:
+            sweep[name] = option
+
+    results = run_suite(sweep, args.engines, args.function, args.min_time, args.max_generations,
+                        args.max_object_cells, args.max_array_cells)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "function": args.function,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Zapisano wyniki do pliku: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESJA {regression['key']}: {regression['current']:.2f} gen/s "
+                  f"(baza {regression['baseline']:.2f}, {regression['ratio']:.0%})")
+        if regressions:
+            return 1
+        print("Brak regresji względem bazy")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
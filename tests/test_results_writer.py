@@ -0,0 +1,34 @@
+import json
+
+from algorithms.results_writer import ResultsWriter
+
+
+def row(value):
+    return {"best_fitness": value, "best_fitness_history": [value, value], "avg_fitness_history": [value, value]}
+
+
+def kill_mid_write(writer, run_id):
+    # Stan po przerwanym zapisie: część historii i połowa wpisu indeksu, bez znaku nowej linii
+    with open(writer.histories.data_paths["best"], "ab") as file:
+        file.write(b"\0" * 12)
+    entry = json.dumps({"run_id": run_id, "best": [0, 2], "avg": [0, 2]})
+    with open(writer.histories.index_path, "a", encoding="utf-8") as file:
+        file.write(entry[:len(entry) // 2])
+
+
+def test_resume_after_interrupted_index_write(tmp_path):
+    writer = ResultsWriter(tmp_path, "batch", resume=False)
+    writer.write("a", row(1.0))
+    kill_mid_write(writer, "b")
+
+    writer = ResultsWriter(tmp_path, "batch", resume=True)
+    assert writer.is_done("a") and not writer.is_done("b")
+    writer.write("b", row(2.0))
+    writer.write("c", row(3.0))
+
+    writer = ResultsWriter(tmp_path, "batch", resume=True)
+    assert all(writer.is_done(run_id) for run_id in "abc")
+    rows = writer.load(with_histories=True)
+    assert [row["run_id"] for row in rows] == ["a", "b", "c"]
+    assert [row["best_fitness_history"] for row in rows] == [[1.0, 1.0], [2.0, 2.0], [3.0, 3.0]]
+